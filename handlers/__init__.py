@@ -5,11 +5,13 @@ from .infobit_generation import handle_infobit_generation
 from .evaluation import handle_evaluation
 from .generation import handle_generation
 from .requirement_extraction import handle_requirement_extraction
+from .progress import ProgressThrottler
 
 __all__ = [
     "handle_infobit_extraction",
     "handle_infobit_generation",
     "handle_evaluation",
     "handle_generation",
-    "handle_requirement_extraction"
+    "handle_requirement_extraction",
+    "ProgressThrottler"
 ]
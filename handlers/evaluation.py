@@ -1,6 +1,21 @@
 """Handler for document evaluation tasks."""
 
-from typing import Dict, Any, Callable
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from src.ai.document_evaluator import DocumentEvaluator
+from src.ai.gemini_client import EVAL_PROMPT_VERSION, DocumentEvaluation
+from src.ai.requirements_text import get_requirements_text
+from src.cache import response_cache
+from src.ai.document_parser import get_document_parser
+from src.storage.supabase_storage import download_file_stream
+from src.database.projects import get_project_with_requirements, update_project
+from src.database.documents import get_project_documents, update_project_document
+
+# Max documents evaluated in parallel (each is a storage download + LLM round-trip)
+EVAL_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "8"))
 
 
 def handle_evaluation(
@@ -21,18 +36,13 @@ def handle_evaluation(
     Returns:
         {"documents_evaluated": N, "overall_score": X.X}
     """
-    from src.ai.document_evaluator import DocumentEvaluator
-    from src.ai.document_parser import DocumentParser
-    from src.storage.supabase_storage import download_file
-    from src.database.projects import get_project_by_id, update_project
-    from src.database.documents import get_project_documents, update_project_document
-
     language = task_data.get("language", "et")
 
     progress_callback(0, "Loading project data...")
 
-    # Get project and documents
-    project = get_project_by_id(project_id)
+    # Get project and documents; documents are fetched once, with only the
+    # columns used below, rather than also embedded in the project record
+    project = get_project_with_requirements(project_id)
     if not project:
         raise Exception("Project not found")
 
@@ -41,62 +51,117 @@ def handle_evaluation(
         raise Exception("No documents found")
 
     # Compile requirements text
-    grant = project.get("grants", {})
-    requirements = grant.get("grant_requirements", [])
-    requirements_text = ""
-    for req in requirements:
-        requirements_text += f"\n## {req.get('name', '')}\n"
-        requirements_text += f"{req.get('description', '')}\n"
-        checklist = req.get("extracted_checklist", [])
-        for item in checklist:
-            if isinstance(item, dict):
-                requirements_text += f"- {item.get('name', '')}: {item.get('description', '')}\n"
-            else:
-                requirements_text += f"- {item}\n"
+    grant = project.get("grants") or {}
+    requirements_text = get_requirements_text(grant)
 
     # Initialize evaluator
     evaluator = DocumentEvaluator(language=language)
-    parser = DocumentParser()
-
-    total_score = 0
-    evaluated_count = 0
-    scores = []
-
-    for i, doc in enumerate(documents):
+    parser = get_document_parser()
+
+    # Requirements are identical for every document, so they are sent once.
+    # The context cache is created (and billed) only when the first document
+    # actually needs the API; skipped and cached documents never trigger it.
+    session = None
+    session_primed = False
+    session_lock = threading.Lock()
+
+    def _get_session():
+        nonlocal session, session_primed
+        with session_lock:
+            if not session_primed:
+                session = evaluator.prime_requirements(requirements_text)
+                session_primed = True
+            return session
+
+    def _process_doc(doc: Dict[str, Any]):
+        """Extract (if needed) and evaluate one document. Runs in a worker thread."""
         doc_name = doc.get("name", "unknown")
-        progress_pct = int((i / len(documents)) * 90)
-        progress_callback(progress_pct, f"Evaluating: {doc_name}")
 
         # Get or extract document text
         doc_text = doc.get("extracted_text", "")
 
         if not doc_text:
-            # Extract text from document
-            file_data = download_file("project-documents", doc["file_path"])
-            if file_data:
-                parsed = parser.parse_document(file_data, doc_name)
+            # Extract text from document, streamed through a spooled temp file
+            fh = download_file_stream("project-documents", doc["file_path"])
+            if fh:
+                with fh:
+                    parsed = parser.parse_document_stream(fh, doc_name)
                 doc_text = parsed.get("text", "")
                 if doc_text:
                     update_project_document(doc["id"], extracted_text=doc_text)
 
         if not doc_text:
-            continue
+            return doc_name, None
+
+        # Fingerprint of everything the evaluation depends on
+        fingerprint = response_cache.make_key(
+            doc_text, requirements_text, language, evaluator.model_id, EVAL_PROMPT_VERSION
+        )
+
+        # Unchanged since the last scoring: keep the stored score
+        if doc.get("last_eval_hash") == fingerprint and doc.get("last_eval_score") is not None:
+            return doc_name, doc["last_eval_score"]
+
+        # Reuse a previous evaluation of identical inputs
+        cache_key = fingerprint
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            evaluation = DocumentEvaluation.model_validate_json(cached)
+            evaluator.save_evaluation(doc["id"], evaluation, fingerprint)
+            return doc_name, evaluation.score
+
+        if response_cache.is_replay():
+            return doc_name, None
 
-        # Evaluate document
+        # Evaluate document (also saves the evaluation to the document record)
         evaluation = evaluator.evaluate_document(
             document_id=doc["id"],
             document_text=doc_text,
             document_name=doc_name,
-            requirements_text=requirements_text
+            requirements_text=requirements_text,
+            session=_get_session(),
+            fingerprint=fingerprint
         )
 
-        if evaluation:
-            total_score += evaluation.score
-            evaluated_count += 1
-            scores.append({
-                "document": doc_name,
-                "score": evaluation.score
-            })
+        if not evaluation:
+            return doc_name, None
+
+        response_cache.put(cache_key, evaluation.model_dump_json().encode("utf-8"))
+        return doc_name, evaluation.score
+
+    # Per-document results in document order; progress follows completion order
+    results: List[Optional[Tuple[str, Any]]] = [None] * len(documents)
+    done = 0
+
+    progress_callback(0, f"Evaluating {len(documents)} documents...")
+
+    try:
+        # Documents are independent and I/O-bound, so evaluate them concurrently.
+        # Aggregation happens here in the calling thread only.
+        max_workers = max(1, min(EVAL_CONCURRENCY, len(documents)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_process_doc, doc): index
+                for index, doc in enumerate(documents)
+            }
+
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                doc_name = results[futures[future]][0]
+                done += 1
+
+                progress_pct = int((done / len(documents)) * 90)
+                progress_callback(progress_pct, f"Evaluated: {doc_name}")
+    finally:
+        evaluator.release_requirements(session)
+
+    scores = [
+        {"document": doc_name, "score": score}
+        for doc_name, score in results
+        if score is not None
+    ]
+    total_score = sum(entry["score"] for entry in scores)
+    evaluated_count = len(scores)
 
     # Calculate and save overall score
     overall_score = None
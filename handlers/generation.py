@@ -1,8 +1,87 @@
 """Handler for document generation tasks."""
 
-from typing import Dict, Any, Callable
+import hashlib
+import io
+import secrets
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Dict, Any, Callable, Optional, NamedTuple, Union
 from datetime import datetime
 
+from src.ai.document_generator import DocumentGenerator, compile_doc_texts
+from src.ai.requirements_text import get_requirements_text
+from src.storage.supabase_storage import upload_project_doc
+from src.database.projects import get_project_by_id, update_project
+from src.database.documents import create_project_result, get_latest_result
+from src.database.sections import get_project_sections
+
+MIME_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+class GenSpec(NamedTuple):
+    """One generatable output: which generator to call and where the result goes."""
+    result_type: str     # output_type value and project_results.result_type
+    method: str          # DocumentGenerator method name
+    result_key: str      # key in the handler's return dict
+    file_prefix: str
+    extension: str
+    label: str           # shown in progress messages
+    uses_sections: bool = False
+
+
+GEN_SPECS = [
+    GenSpec("application_docx_from_sections", "generate_docx_from_sections", "docx_path",
+            "application", "docx", "application document", uses_sections=True),
+    GenSpec("application_docx", "generate_application_docx", "docx_path",
+            "application", "docx", "application document"),
+    GenSpec("budget_xlsx", "generate_budget_xlsx", "xlsx_path",
+            "budget", "xlsx", "budget spreadsheet"),
+    GenSpec("cover_letter_docx", "generate_cover_letter_docx", "cover_letter_path",
+            "cover_letter", "docx", "cover letter"),
+    GenSpec("executive_summary_docx", "generate_executive_summary_docx", "executive_summary_path",
+            "executive_summary", "docx", "executive summary"),
+    GenSpec("timeline_xlsx", "generate_timeline_xlsx", "timeline_path",
+            "timeline", "xlsx", "timeline"),
+    GenSpec("risk_analysis_docx", "generate_risk_analysis_docx", "risk_analysis_path",
+            "risk_analysis", "docx", "risk analysis"),
+]
+
+
+# Zip members rewritten on every build (created/modified timestamps)
+_VOLATILE_MEMBERS = frozenset({"docProps/core.xml"})
+
+
+def _content_digest(file_data: Union[bytes, io.BytesIO]) -> str:
+    """
+    SHA-256 of generated DOCX/XLSX content, ignoring build timestamps.
+
+    python-docx and openpyxl stamp docProps/core.xml on every save, so the
+    raw bytes of two identical builds never match. The digest covers every
+    other zip member by name and content instead. Anything that isn't a
+    zip is hashed as-is.
+    """
+    buffer = file_data if isinstance(file_data, io.BytesIO) else io.BytesIO(file_data)
+    position = buffer.tell()
+    digest = hashlib.sha256()
+    try:
+        buffer.seek(0)
+        with zipfile.ZipFile(buffer) as archive:
+            for name in sorted(archive.namelist()):
+                if name in _VOLATILE_MEMBERS:
+                    continue
+                data = archive.read(name)
+                digest.update(f"{name}\0{len(data)}\0".encode())
+                digest.update(data)
+    except zipfile.BadZipFile:
+        digest = hashlib.sha256(buffer.getbuffer())
+    finally:
+        buffer.seek(position)
+    return digest.hexdigest()
+
 
 def handle_generation(
     db,
@@ -29,31 +108,20 @@ def handle_generation(
     Returns:
         {"docx_path": "...", "xlsx_path": "..."}
     """
-    from src.ai.document_generator import DocumentGenerator
-    from src.storage.supabase_storage import upload_project_doc
-    from src.database.projects import get_project_by_id, update_project
-    from src.database.documents import create_project_result
-
     language = task_data.get("language", "et")
 
     # Support both new output_type format and legacy format
     output_type = task_data.get("output_type")
     if output_type:
-        generate_docx = output_type == "application_docx"
-        generate_xlsx = output_type == "budget_xlsx"
-        generate_from_sections = output_type == "application_docx_from_sections"
-        generate_cover_letter = output_type == "cover_letter_docx"
-        generate_executive_summary = output_type == "executive_summary_docx"
-        generate_timeline = output_type == "timeline_xlsx"
-        generate_risk_analysis = output_type == "risk_analysis_docx"
+        requested = {output_type}
     else:
-        generate_docx = task_data.get("generate_docx", True)
-        generate_xlsx = task_data.get("generate_xlsx", False)
-        generate_from_sections = False
-        generate_cover_letter = False
-        generate_executive_summary = False
-        generate_timeline = False
-        generate_risk_analysis = False
+        requested = set()
+        if task_data.get("generate_docx", True):
+            requested.add("application_docx")
+        if task_data.get("generate_xlsx", False):
+            requested.add("budget_xlsx")
+
+    active = [spec for spec in GEN_SPECS if spec.result_type in requested]
 
     progress_callback(0, "Loading project data...")
 
@@ -63,233 +131,93 @@ def handle_generation(
         raise Exception("Project not found")
 
     # Compile requirements text
-    grant = project.get("grants", {})
-    requirements = grant.get("grant_requirements", [])
-    requirements_text = ""
-    for req in requirements:
-        requirements_text += f"\n## {req.get('name', '')}\n"
-        requirements_text += f"{req.get('description', '')}\n"
+    grant = project.get("grants") or {}
+    requirements_text = get_requirements_text(grant, include_checklist=False)
 
     generator = DocumentGenerator(language=language)
     result = {}
 
-    # Generate from pre-edited sections
-    if generate_from_sections:
-        from src.database.sections import get_project_sections
-
-        progress_callback(20, "Loading sections...")
-        sections = get_project_sections(project_id)
-
-        if not sections:
-            raise Exception("No sections found for this project")
-
-        progress_callback(40, "Generating application document from sections...")
-
-        docx_bytes = generator.generate_docx_from_sections(
-            project_name=project.get("name", "Application"),
-            grant_name=grant.get("name", ""),
-            sections=sections
-        )
-
-        if docx_bytes:
-            progress_callback(60, "Saving DOCX...")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"application_{timestamp}.docx"
-
-            file_path = upload_project_doc(
-                user_id,
-                project_id,
-                docx_bytes,
-                filename,
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    # One timestamp + random suffix per run so concurrent artifacts never collide
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    uid = secrets.token_hex(3)
+
+    # Walk project_documents once; every generator reuses the result
+    doc_texts = compile_doc_texts(project)
+
+    jobs = []
+    for spec in active:
+        if spec.uses_sections:
+            # Generate from pre-edited sections
+            progress_callback(10, "Loading sections...")
+            sections = get_project_sections(project_id)
+
+            if not sections:
+                raise Exception("No sections found for this project")
+
+            project_name = project.get("name", "Application")
+            grant_name = grant.get("name", "")
+            job = partial(
+                getattr(generator, spec.method),
+                project_name=project_name,
+                grant_name=grant_name,
+                sections=sections
             )
-
-            if file_path:
-                create_project_result(
-                    project_id=project_id,
-                    result_type="application_docx_from_sections",
-                    file_path=file_path
-                )
-                result["docx_path"] = file_path
-
-    # Generate traditional DOCX (AI-generated content)
-    elif generate_docx:
-        progress_callback(20, "Generating application document...")
-
-        docx_bytes = generator.generate_application_docx(
-            project=project,
-            requirements_text=requirements_text
-        )
-
-        if docx_bytes:
-            progress_callback(40, "Saving DOCX...")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"application_{timestamp}.docx"
-
-            file_path = upload_project_doc(
-                user_id,
-                project_id,
-                docx_bytes,
-                filename,
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        else:
+            job = partial(
+                getattr(generator, spec.method),
+                project=project, requirements_text=requirements_text, doc_texts=doc_texts
             )
-
-            if file_path:
-                create_project_result(
-                    project_id=project_id,
-                    result_type="application_docx",
-                    file_path=file_path
-                )
-                result["docx_path"] = file_path
-
-    if generate_xlsx:
-        progress_callback(60, "Generating budget spreadsheet...")
-
-        xlsx_bytes = generator.generate_budget_xlsx(
-            project=project,
-            requirements_text=requirements_text
+        jobs.append((spec, job))
+
+    def _make_artifact(spec: GenSpec, job: Callable[[], Any]) -> Optional[str]:
+        """Generate, upload and record one artifact. Runs in a worker thread."""
+        file_data = job()
+        if not file_data:
+            return None
+
+        # Identical to the latest stored result: reuse it instead of re-uploading
+        digest = _content_digest(file_data)
+        latest = get_latest_result(project_id, spec.result_type)
+        if latest and latest.get("content_sha256") == digest:
+            return latest["file_path"]
+
+        filename = f"{spec.file_prefix}_{ts}_{uid}.{spec.extension}"
+        file_path = upload_project_doc(
+            user_id,
+            project_id,
+            file_data,
+            filename,
+            MIME_TYPES[spec.extension]
         )
 
-        if xlsx_bytes:
-            progress_callback(80, "Saving XLSX...")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"budget_{timestamp}.xlsx"
-
-            file_path = upload_project_doc(
-                user_id,
-                project_id,
-                xlsx_bytes,
-                filename,
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        if file_path:
+            create_project_result(
+                project_id=project_id,
+                result_type=spec.result_type,
+                file_path=file_path,
+                content_sha256=digest
             )
-
-            if file_path:
-                create_project_result(
-                    project_id=project_id,
-                    result_type="budget_xlsx",
-                    file_path=file_path
-                )
-                result["xlsx_path"] = file_path
-
-    # Generate cover letter
-    if generate_cover_letter:
-        progress_callback(20, "Generating cover letter...")
-
-        docx_bytes = generator.generate_cover_letter_docx(
-            project=project,
-            requirements_text=requirements_text
-        )
-
-        if docx_bytes:
-            progress_callback(60, "Saving cover letter...")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"cover_letter_{timestamp}.docx"
-
-            file_path = upload_project_doc(
-                user_id,
-                project_id,
-                docx_bytes,
-                filename,
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            )
-
-            if file_path:
-                create_project_result(
-                    project_id=project_id,
-                    result_type="cover_letter_docx",
-                    file_path=file_path
-                )
-                result["cover_letter_path"] = file_path
-
-    # Generate executive summary
-    if generate_executive_summary:
-        progress_callback(20, "Generating executive summary...")
-
-        docx_bytes = generator.generate_executive_summary_docx(
-            project=project,
-            requirements_text=requirements_text
-        )
-
-        if docx_bytes:
-            progress_callback(60, "Saving executive summary...")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"executive_summary_{timestamp}.docx"
-
-            file_path = upload_project_doc(
-                user_id,
-                project_id,
-                docx_bytes,
-                filename,
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            )
-
-            if file_path:
-                create_project_result(
-                    project_id=project_id,
-                    result_type="executive_summary_docx",
-                    file_path=file_path
-                )
-                result["executive_summary_path"] = file_path
-
-    # Generate timeline
-    if generate_timeline:
-        progress_callback(20, "Generating timeline...")
-
-        xlsx_bytes = generator.generate_timeline_xlsx(
-            project=project,
-            requirements_text=requirements_text
-        )
-
-        if xlsx_bytes:
-            progress_callback(60, "Saving timeline...")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"timeline_{timestamp}.xlsx"
-
-            file_path = upload_project_doc(
-                user_id,
-                project_id,
-                xlsx_bytes,
-                filename,
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-
-            if file_path:
-                create_project_result(
-                    project_id=project_id,
-                    result_type="timeline_xlsx",
-                    file_path=file_path
-                )
-                result["timeline_path"] = file_path
-
-    # Generate risk analysis
-    if generate_risk_analysis:
-        progress_callback(20, "Generating risk analysis...")
-
-        docx_bytes = generator.generate_risk_analysis_docx(
-            project=project,
-            requirements_text=requirements_text
-        )
-
-        if docx_bytes:
-            progress_callback(60, "Saving risk analysis...")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"risk_analysis_{timestamp}.docx"
-
-            file_path = upload_project_doc(
-                user_id,
-                project_id,
-                docx_bytes,
-                filename,
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            )
-
-            if file_path:
-                create_project_result(
-                    project_id=project_id,
-                    result_type="risk_analysis_docx",
-                    file_path=file_path
-                )
-                result["risk_analysis_path"] = file_path
+        return file_path
+
+    # Each artifact runs generate -> upload -> record in its own thread, so one
+    # artifact's upload overlaps the others' generation. The result dict is
+    # only touched here in the calling thread.
+    if jobs:
+        labels = ", ".join(spec.label for spec, _ in jobs)
+        progress_callback(20, f"Generating {labels}...")
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = {executor.submit(_make_artifact, spec, job): spec for spec, job in jobs}
+
+            for future in as_completed(futures):
+                spec = futures[future]
+                file_path = future.result()
+                done += 1
+
+                if file_path:
+                    result[spec.result_key] = file_path
+                progress_callback(20 + int((done / len(jobs)) * 70), f"Saved {spec.label}")
 
     # Update project status
     if result:
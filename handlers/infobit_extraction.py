@@ -1,8 +1,22 @@
 """Handler for infobit extraction tasks."""
 
 import gc
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, Callable
 
+from src.ai.infobit_extractor import extract_infobits_from_text
+from src.ai.document_parser import parse_document_stream
+from src.storage.supabase_storage import download_file_stream
+from src.database.infobits import get_empty_infobits, bulk_update_infobits, calculate_completion
+from src.database.projects import update_project
+
+log = logging.getLogger(__name__)
+
+# Max files downloaded/extracted in parallel (bounded for Render's memory limits)
+INFOBIT_EXTRACT_CONCURRENCY = int(os.getenv("INFOBIT_EXTRACT_CONCURRENCY", "4"))
+
 
 def handle_infobit_extraction(
     db,
@@ -25,67 +39,85 @@ def handle_infobit_extraction(
     Returns:
         {"files_processed": N, "fields_filled": M}
     """
-    from src.ai.infobit_extractor import extract_infobits_from_document
-    from src.storage.supabase_storage import download_file
-    from src.database.infobits import get_empty_infobits, update_infobit, calculate_completion
-    from src.database.projects import update_project
-
     files = task_data.get("files", [])
     language = task_data.get("language", "et")
 
     progress_callback(0, "Starting extraction...")
 
-    # Get empty infobits for this project
+    # Get empty infobits for this project, indexed by field name
     empty_infobits = get_empty_infobits(project_id)
+    empty_by_field = {ib["field_name"]: ib for ib in empty_infobits}
     total_filled = 0
     processed_files = 0
 
-    for i, file_info in enumerate(files):
+    def _download_and_extract(file_info: Dict[str, Any]):
+        """Download one file and run AI extraction on it. Runs in a worker thread."""
         file_name = file_info.get("name", "unknown")
         file_path = file_info.get("path", "")
 
-        progress_pct = int((i / len(files)) * 90)
-        progress_callback(progress_pct, f"Processing: {file_name}")
-
-        # Download file from storage
-        file_data = download_file("project-documents", file_path)
-        if not file_data:
-            print(f"Could not download file: {file_path}")
-            continue
-
-        processed_files += 1
-
-        # Extract infobits
-        result = extract_infobits_from_document(
-            file_data, file_name, empty_infobits, language
+        # Stream file from storage into a spooled temp file
+        fh = download_file_stream("project-documents", file_path)
+        if not fh:
+            log.warning(f"Could not download file: {file_path}")
+            return file_name, False, None
+
+        try:
+            with fh:
+                document_text = parse_document_stream(fh, file_name)
+        except Exception as e:
+            log.error(f"Error parsing document: {e}")
+            return file_name, True, None
+
+        # Every file sees the same snapshot of empty fields; duplicates
+        # are resolved by the single writer below
+        result = extract_infobits_from_text(
+            document_text, file_name, empty_infobits, language
         )
-
-        if result and result.extractions:
-            for ext in result.extractions:
-                # Find matching infobit and update
-                for infobit in empty_infobits:
-                    if infobit["field_name"] == ext.field_name:
-                        update_infobit(
-                            infobit["id"],
-                            ext.extracted_value,
-                            source=f"ai:{file_name[:15]}",
-                            confidence=ext.confidence
-                        )
-                        total_filled += 1
-                        # Remove from empty list to avoid overwriting
-                        empty_infobits = [
-                            ib for ib in empty_infobits
-                            if ib["id"] != infobit["id"]
-                        ]
-                        break
-
-        # Free memory between files to prevent OOM on Render free tier
-        del file_data
-        gc.collect()
+        # Drop the document text before this thread picks up the next file
+        del document_text
+        return file_name, True, result
+
+    done = 0
+    if files:
+        max_workers = max(1, min(INFOBIT_EXTRACT_CONCURRENCY, len(files)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_download_and_extract, f) for f in files]
+
+            # DB writes stay in this thread to keep contention low
+            for future in as_completed(futures):
+                file_name, downloaded, result = future.result()
+                done += 1
+
+                if downloaded:
+                    processed_files += 1
+
+                if result and result.extractions:
+                    pending = []
+                    for ext in result.extractions:
+                        # Pop the matching infobit so other files don't overwrite it
+                        infobit = empty_by_field.pop(ext.field_name, None)
+                        if infobit:
+                            pending.append({
+                                "id": infobit["id"],
+                                "value": ext.extracted_value,
+                                "source": f"ai:{file_name[:15]}",
+                                "confidence": ext.confidence,
+                            })
+
+                    # One bulk update per file instead of one update per field
+                    if pending and bulk_update_infobits(pending):
+                        total_filled += len(pending)
+
+                # Free each file's extraction before the next one lands
+                # (memory pressure on Render's small instances)
+                del result
+                gc.collect()
+
+                progress_pct = int((done / len(files)) * 90)
+                progress_callback(progress_pct, f"Processed: {file_name}")
 
     # Update project completion
     progress_callback(95, "Updating completion...")
-    from src.database.infobits import calculate_completion
     new_completion = calculate_completion(project_id)
     update_project(project_id, infobits_completion=new_completion)
 
@@ -2,6 +2,10 @@
 
 from typing import Dict, Any, Callable
 
+from src.ai.infobit_generator import generate_infobits_for_grant, get_default_infobits
+from src.database.infobits import create_infobits
+from src.database.projects import update_project
+
 
 def handle_infobit_generation(
     db,
@@ -22,10 +26,6 @@ def handle_infobit_generation(
     Returns:
         {"infobits_count": N}
     """
-    from src.ai.infobit_generator import generate_infobits_for_grant, get_default_infobits
-    from src.database.infobits import create_infobits
-    from src.database.projects import update_project
-
     grant_id = task_data.get("grant_id")
     language = task_data.get("language", "et")
 
@@ -0,0 +1,30 @@
+"""Import task handlers and their heavy dependencies once at worker start."""
+
+import importlib
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+# Handler modules plus libraries the parser only imports on first use
+PRELOAD_MODULES = [
+    "handlers.infobit_extraction",
+    "handlers.infobit_generation",
+    "handlers.evaluation",
+    "handlers.generation",
+    "handlers.requirement_extraction",
+    "docx",
+    "openpyxl",
+    "PyPDF2",
+]
+
+
+def preload_handlers() -> None:
+    """Import PRELOAD_MODULES so the first task doesn't pay the import cost."""
+    started = time.monotonic()
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            log.warning(f"⚠️ Could not preload {module_name}: {e}")
+    log.info(f"✅ Handlers preloaded in {time.monotonic() - started:.1f}s")
@@ -0,0 +1,91 @@
+"""Progress callback helpers shared by task handlers."""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, str], None]
+
+
+class ProgressThrottler:
+    """
+    Coalesce progress updates so each task writes task_queue rarely.
+
+    An update is sent immediately when progress moved by at least
+    min_delta or min_interval seconds passed since the last send; 0 and
+    100 are always sent. Anything else is held back and the most recent
+    one is flushed by a timer, so the last message is never lost.
+    Safe to call from worker threads.
+    """
+
+    def __init__(
+        self,
+        send: ProgressCallback,
+        min_delta: int = 1,
+        min_interval: float = 0.5
+    ):
+        """
+        Initialize the throttler.
+
+        Args:
+            send: Callback that actually writes the update
+            min_delta: Minimum progress change to send immediately
+            min_interval: Minimum seconds between sends of repeats
+        """
+        self._send = send
+        self.min_delta = min_delta
+        self.min_interval = min_interval
+        self.last_sent_pct: Optional[int] = None
+        self.last_sent_ts = 0.0
+        self._pending: Optional[Tuple[int, str]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+    def __call__(self, progress: int, message: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self.last_sent_pct is None
+                or progress in (0, 100)
+                or abs(progress - self.last_sent_pct) >= self.min_delta
+                or now - self.last_sent_ts >= self.min_interval
+            ):
+                self._pending = None
+                self._emit(progress, message)
+                return
+
+            # Hold it back; the timer sends whatever is newest when it fires
+            self._pending = (progress, message)
+            if self._timer is None:
+                delay = self.min_interval - (now - self.last_sent_ts)
+                self._timer = threading.Timer(max(delay, 0.0), self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _emit(self, progress: int, message: str) -> None:
+        """Send an update (lock held)."""
+        self.last_sent_pct = progress
+        self.last_sent_ts = time.monotonic()
+        try:
+            self._send(progress, message)
+        except Exception as e:
+            log.error(f"Error sending progress: {e}")
+
+    def flush(self) -> None:
+        """Send the held-back update, if any."""
+        with self._lock:
+            self._timer = None
+            if self._pending is not None:
+                progress, message = self._pending
+                self._pending = None
+                self._emit(progress, message)
+
+    def close(self) -> None:
+        """Cancel the timer and flush; call before completing the task."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self.flush()
@@ -1,7 +1,14 @@
 """Handler for grant requirement extraction tasks."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, Callable
 
+from src.ai.requirements_extractor import RequirementsExtractor
+
+# Max requirement documents downloaded/processed in parallel
+REQ_EXTRACT_CONCURRENCY = int(os.getenv("REQ_EXTRACT_CONCURRENCY", "6"))
+
 
 def handle_requirement_extraction(
     db,
@@ -22,9 +29,6 @@ def handle_requirement_extraction(
     Returns:
         {"requirements_processed": N, "items_extracted": M}
     """
-    from src.ai.requirements_extractor import RequirementsExtractor
-    from src.database.grants import get_grant_requirements, update_grant_requirement
-
     requirement_ids = task_data.get("requirement_ids", [])
     language = task_data.get("language", "et")
 
@@ -32,12 +36,11 @@ def handle_requirement_extraction(
 
     # Get requirements to process
     if requirement_ids:
-        # Process specific requirements
-        requirements = []
-        for rid in requirement_ids:
-            req = db.table("grant_requirements").select("*").eq("id", rid).execute()
-            if req.data:
-                requirements.append(req.data[0])
+        # Process specific requirements, fetched in one query
+        result = db.table("grant_requirements").select("*").in_("id", requirement_ids).execute()
+        by_id = {r["id"]: r for r in result.data or []}
+        # Keep the order the caller asked for
+        requirements = [by_id[rid] for rid in requirement_ids if rid in by_id]
     else:
         # Get all requirements that need processing
         result = db.table("grant_requirements").select("*").is_("extracted_checklist", "null").execute()
@@ -51,24 +54,35 @@ def handle_requirement_extraction(
     total_items = 0
     processed_count = 0
 
-    for i, req in enumerate(requirements):
-        req_name = req.get("name", "unknown")
-        progress_pct = int((i / len(requirements)) * 90)
-        progress_callback(progress_pct, f"Processing: {req_name}")
-
-        file_path = req.get("file_path")
-        if not file_path:
-            continue
-
-        # Extract requirements
-        result = extractor.process_requirement_document(
-            requirement_id=req["id"],
-            file_path=file_path
-        )
-
-        if result and result.checklist:
-            total_items += len(result.checklist)
-            processed_count += 1
+    # Requirements without a file have nothing to extract
+    pending = [req for req in requirements if req.get("file_path")]
+    done = len(requirements) - len(pending)
+
+    if pending:
+        max_workers = max(1, min(REQ_EXTRACT_CONCURRENCY, len(pending)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    extractor.process_requirement_document,
+                    requirement_id=req["id"],
+                    file_path=req["file_path"]
+                ): req
+                for req in pending
+            }
+
+            # Results are aggregated in this thread, so no lock is needed
+            for future in as_completed(futures):
+                req_name = futures[future].get("name", "unknown")
+                done += 1
+
+                result = future.result()
+
+                if result and result.checklist:
+                    total_items += len(result.checklist)
+                    processed_count += 1
+
+                progress_pct = int((done / len(requirements)) * 90)
+                progress_callback(progress_pct, f"Processed: {req_name}")
 
     progress_callback(100, "Extraction complete")
 
@@ -3,70 +3,130 @@ Background worker service for GrantWriter.
 Polls Supabase task_queue and processes tasks.
 """
 
+import logging
 import os
+import queue
+import select
 import sys
+import threading
 import time
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
 
-from supabase import create_client
+from src.database.connection import get_db
+from src.database.retry import retry_db
+from src.utils.log import setup_logging
 
-WORKER_ID = str(uuid.uuid4())[:8]
-POLL_INTERVAL = 5  # seconds
-
-
-def get_db():
-    """Get Supabase client."""
-    return create_client(
-        os.environ["SUPABASE_URL"],
-        os.environ["SUPABASE_KEY"]
-    )
+log = logging.getLogger(__name__)
 
+try:
+    import psycopg2
+    from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+except ImportError:  # optional: without it the worker just polls
+    psycopg2 = None
 
-def claim_task(db):
+WORKER_ID = str(uuid.uuid4())[:8]
+POLL_INTERVAL = 5  # seconds (fallback when no notification arrives)
+# Tasks processed at once by this worker (handlers mostly wait on Gemini/Supabase)
+WORKER_CONCURRENCY = max(1, int(os.environ.get("WORKER_CONCURRENCY", "2")))
+
+# Direct (session-mode) Postgres URL for LISTEN; the transaction pooler drops notifications
+DATABASE_URL = os.environ.get("DATABASE_URL")
+NOTIFY_CHANNEL = "task_queue"
+LISTEN_RETRY_INTERVAL = 60  # seconds between reconnect attempts
+
+
+# task_type -> handler, built once on first use (see _get_handlers)
+_HANDLERS: Optional[Dict[str, Callable]] = None
+_HANDLERS_LOCK = threading.Lock()
+# handlers.ProgressThrottler, bound alongside _HANDLERS
+_ProgressThrottler: Optional[type] = None
+
+
+def _get_handlers() -> Dict[str, Callable]:
+    """Import the handlers package once, build the dispatch table and bind _ProgressThrottler."""
+    global _HANDLERS, _ProgressThrottler
+    if _HANDLERS is None:
+        with _HANDLERS_LOCK:
+            if _HANDLERS is None:
+                # Imported lazily to avoid circular imports
+                from handlers import (
+                    ProgressThrottler,
+                    handle_infobit_extraction,
+                    handle_infobit_generation,
+                    handle_evaluation,
+                    handle_generation,
+                    handle_requirement_extraction
+                )
+
+                _ProgressThrottler = ProgressThrottler
+                _HANDLERS = {
+                    "infobit_extraction": handle_infobit_extraction,
+                    "infobit_generation": handle_infobit_generation,
+                    "evaluation": handle_evaluation,
+                    "generation": handle_generation,
+                    "requirement_extraction": handle_requirement_extraction,
+                }
+    return _HANDLERS
+
+
+# The task_queue helpers below fetch the client via get_db() on every
+# attempt: retry_db may rebuild it after repeated connection errors.
+
+def claim_task():
     """Atomically claim a pending task."""
     try:
-        result = db.rpc("claim_next_task", {"worker": WORKER_ID}).execute()
+        result = retry_db(
+            lambda: get_db().rpc("claim_next_task", {"worker": WORKER_ID}).execute(),
+            name="claim_task"
+        )
         return result.data[0] if result.data else None
     except Exception as e:
-        print(f"Error claiming task: {e}")
+        log.error(f"Error claiming task: {e}")
         return None
 
 
-def update_task_progress(db, task_id: str, progress: int, message: str):
+def update_task_progress(task_id: str, progress: int, message: str):
     """Update task progress."""
     try:
-        db.table("task_queue").update({
-            "progress": progress,
-            "progress_message": message
-        }).eq("id", task_id).execute()
+        # Fewer attempts: runs on the task thread and a later update supersedes it
+        retry_db(
+            lambda: get_db().table("task_queue").update({
+                "progress": progress,
+                "progress_message": message
+            }).eq("id", task_id).execute(),
+            retries=3,
+            name="update_task_progress"
+        )
     except Exception as e:
-        print(f"Error updating progress: {e}")
+        log.error(f"Error updating progress: {e}")
 
 
-def complete_task(db, task_id: str, result_data: dict):
-    """Mark task as completed."""
+def complete_task(task_id: str, result_data: dict):
+    """Mark task as completed (completed_at is set by the DB)."""
     try:
-        db.table("task_queue").update({
-            "status": "completed",
-            "progress": 100,
-            "result_data": result_data,
-            "completed_at": datetime.utcnow().isoformat()
-        }).eq("id", task_id).execute()
+        retry_db(
+            lambda: get_db().rpc(
+                "complete_task", {"_id": task_id, "_result": result_data}
+            ).execute(),
+            name="complete_task"
+        )
     except Exception as e:
-        print(f"Error completing task: {e}")
+        log.error(f"Error completing task: {e}")
 
 
-def fail_task(db, task_id: str, error_message: str):
-    """Mark task as failed."""
+def fail_task(task_id: str, error_message: str):
+    """Mark task as failed (completed_at is set by the DB)."""
     try:
-        db.table("task_queue").update({
-            "status": "failed",
-            "error_message": error_message,
-            "completed_at": datetime.utcnow().isoformat()
-        }).eq("id", task_id).execute()
+        retry_db(
+            lambda: get_db().rpc(
+                "fail_task", {"_id": task_id, "_error": error_message}
+            ).execute(),
+            name="fail_task"
+        )
     except Exception as e:
-        print(f"Error failing task: {e}")
+        log.error(f"Error failing task: {e}")
 
 
 def process_task(db, task: dict):
@@ -77,34 +137,21 @@ def process_task(db, task: dict):
     user_id = task.get("user_id")
     project_id = task.get("project_id")
 
-    print(f"[{WORKER_ID}] Processing {task_type} task {task_id}")
-
-    try:
-        # Import handlers lazily to avoid circular imports
-        from handlers import (
-            handle_infobit_extraction,
-            handle_infobit_generation,
-            handle_evaluation,
-            handle_generation,
-            handle_requirement_extraction
-        )
+    log_extra = {"worker": WORKER_ID, "task_id": task_id, "task_type": task_type}
+    log.info("Processing task", extra=log_extra)
 
-        handlers = {
-            "infobit_extraction": handle_infobit_extraction,
-            "infobit_generation": handle_infobit_generation,
-            "evaluation": handle_evaluation,
-            "generation": handle_generation,
-            "requirement_extraction": handle_requirement_extraction,
-        }
+    progress_callback = None
 
-        handler = handlers.get(task_type)
+    try:
+        handler = _get_handlers().get(task_type)
         if not handler:
-            fail_task(db, task_id, f"Unknown task type: {task_type}")
+            fail_task(task_id, f"Unknown task type: {task_type}")
             return
 
-        # Create progress callback
-        def progress_callback(progress: int, message: str):
-            update_task_progress(db, task_id, progress, message)
+        # Create progress callback (coalesced to cut task_queue UPDATEs)
+        progress_callback = _ProgressThrottler(
+            lambda progress, message: update_task_progress(task_id, progress, message)
+        )
 
         # Execute handler
         result = handler(
@@ -115,82 +162,174 @@ def process_task(db, task: dict):
             progress_callback=progress_callback
         )
 
-        complete_task(db, task_id, result)
-        print(f"[{WORKER_ID}] Completed task {task_id}")
+        # Flush any held-back update so it can't land after completion
+        progress_callback.close()
+        complete_task(task_id, result)
+        log.info("Completed task", extra=log_extra)
+
+    except Exception as e:
+        log.error(f"Error processing task: {e}", extra=log_extra)
+        if progress_callback is not None:
+            progress_callback.close()
+        fail_task(task_id, str(e))
+
+
+def open_listener():
+    """Open a connection listening for task_queue inserts, or None to poll only."""
+    if not DATABASE_URL or psycopg2 is None:
+        return None
+    try:
+        conn = psycopg2.connect(DATABASE_URL)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {NOTIFY_CHANNEL};")
+        log.info(f"👂 Listening on '{NOTIFY_CHANNEL}' channel")
+        return conn
+    except Exception as e:
+        log.warning(f"⚠️ Could not LISTEN, falling back to polling: {e}")
+        return None
+
+
+def wait_for_task(listener):
+    """
+    Wait until a task may be available.
+
+    Blocks for at most POLL_INTERVAL; with a listener it wakes as soon as a
+    notification arrives. NOTIFY is best-effort, so the timeout stays as a
+    safety net either way.
 
+    Returns:
+        The listener, or None if it broke and polling should take over
+    """
+    if listener is None:
+        time.sleep(POLL_INTERVAL)
+        return None
+    try:
+        readable, _, _ = select.select([listener], [], [], POLL_INTERVAL)
+        if readable:
+            listener.poll()
+            listener.notifies.clear()
+        return listener
     except Exception as e:
-        print(f"[{WORKER_ID}] Error processing task {task_id}: {e}")
-        fail_task(db, task_id, str(e))
+        log.warning(f"⚠️ Listener connection lost: {e}")
+        try:
+            listener.close()
+        except Exception:
+            pass
+        return None
+
+
+def prefetch_tasks(tasks: queue.Queue, slots: threading.Semaphore):
+    """
+    Claim tasks on a background thread as execution slots free up.
+
+    Runs on its own thread. A slot is acquired before each claim and only
+    released when the task finishes, so a claimed task never waits behind
+    running ones: claim_next_task stamps started_at, and a task sitting in
+    a local queue would look stale to recover_stale_tasks on other workers
+    and run twice. While nothing is pending the thread waits on
+    LISTEN/NOTIFY (or polls).
+
+    Args:
+        tasks: Queue the main loop takes tasks from
+        slots: Semaphore with WORKER_CONCURRENCY permits
+    """
+    listener = open_listener()
+    last_listen_attempt = time.monotonic()
+
+    while True:
+        slots.acquire()
+        try:
+            task = claim_task()
+            while not task:
+                if listener is None and DATABASE_URL and \
+                        time.monotonic() - last_listen_attempt > LISTEN_RETRY_INTERVAL:
+                    listener = open_listener()
+                    last_listen_attempt = time.monotonic()
+                listener = wait_for_task(listener)
+                task = claim_task()
+            log.info("📋 Claimed task", extra={"task_id": task.get("id")})
+            tasks.put(task)
+        except Exception as e:
+            slots.release()
+            log.error(f"❌ Error in prefetch loop: {e}")
+            time.sleep(POLL_INTERVAL)
 
 
 def recover_stale_tasks(db):
     """Reset tasks stuck in 'processing' status (from crashed workers)."""
     try:
-        # Find tasks stuck in processing for more than 2 minutes
-        from datetime import timedelta, timezone
-        cutoff = (datetime.now(timezone.utc) - timedelta(minutes=2)).isoformat()
-
-        result = db.table("task_queue").select("id, task_type, started_at").eq(
-            "status", "processing"
-        ).lt("started_at", cutoff).execute()
+        # One set-based UPDATE for tasks stuck in processing for more than 2 minutes
+        result = db.rpc("requeue_stale_tasks", {"_cutoff_seconds": 120}).execute()
 
         stale_tasks = result.data or []
         if stale_tasks:
-            print(f"🔄 Found {len(stale_tasks)} stale tasks to recover", flush=True)
+            log.info(f"🔄 Recovered {len(stale_tasks)} stale tasks")
             for task in stale_tasks:
-                db.table("task_queue").update({
-                    "status": "pending",
-                    "progress": 0,
-                    "progress_message": "Requeued after worker restart",
-                    "worker_id": None
-                }).eq("id", task["id"]).execute()
-                print(f"  ↩️ Reset task {task['id']} ({task['task_type']})", flush=True)
+                log.info(f"  ↩️ Reset task {task['id']} ({task['task_type']})")
     except Exception as e:
-        print(f"⚠️ Error recovering stale tasks: {e}", flush=True)
+        log.warning(f"⚠️ Error recovering stale tasks: {e}")
 
 
 def main():
     """Main worker loop."""
-    print(f"🚀 Worker {WORKER_ID} starting...", flush=True)
-    print(f"📊 Poll interval: {POLL_INTERVAL}s", flush=True)
+    setup_logging()
+    log.info(f"🚀 Worker {WORKER_ID} starting...")
+    log.info(f"📊 Poll interval: {POLL_INTERVAL}s, concurrency: {WORKER_CONCURRENCY}")
 
     # Verify environment variables
     if not os.environ.get("SUPABASE_URL"):
-        print("❌ ERROR: SUPABASE_URL not set!", flush=True)
+        log.error("❌ ERROR: SUPABASE_URL not set!")
         sys.exit(1)
     if not os.environ.get("SUPABASE_KEY"):
-        print("❌ ERROR: SUPABASE_KEY not set!", flush=True)
+        log.error("❌ ERROR: SUPABASE_KEY not set!")
         sys.exit(1)
 
-    print("✅ Environment variables OK", flush=True)
+    log.info("✅ Environment variables OK")
+
+    # Import handlers up front so the first task doesn't pay the cold-start cost
+    from handlers.preload import preload_handlers
+    preload_handlers()
+    _get_handlers()
 
     try:
         db = get_db()
-        print("✅ Connected to Supabase", flush=True)
+        log.info("✅ Connected to Supabase")
     except Exception as e:
-        print(f"❌ Failed to connect to Supabase: {e}", flush=True)
+        log.error(f"❌ Failed to connect to Supabase: {e}")
         sys.exit(1)
 
     # Recover any stuck tasks from previous worker crashes
     recover_stale_tasks(db)
 
-    print("👀 Polling for tasks...", flush=True)
+    log.info("👀 Polling for tasks...")
+
+    # Claiming happens on the prefetch thread; this thread only hands tasks to the pool
+    tasks: queue.Queue = queue.Queue(maxsize=WORKER_CONCURRENCY)
+    slots = threading.Semaphore(WORKER_CONCURRENCY)
+    threading.Thread(
+        target=prefetch_tasks, args=(tasks, slots), name="prefetch", daemon=True
+    ).start()
+
+    # Tasks run on a bounded pool
+    executor = ThreadPoolExecutor(max_workers=WORKER_CONCURRENCY, thread_name_prefix="task")
 
     while True:
         try:
-            task = claim_task(db)
-            if task:
-                print(f"📋 Claimed task: {task.get('id')}", flush=True)
-                process_task(db, task)
-            else:
-                time.sleep(POLL_INTERVAL)
+            try:
+                task = tasks.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            # The slot taken by prefetch_tasks frees up once the task is done
+            future = executor.submit(process_task, get_db(), task)
+            future.add_done_callback(lambda _: slots.release())
         except KeyboardInterrupt:
-            print(f"\n👋 Worker {WORKER_ID} shutting down...", flush=True)
+            log.info(f"👋 Worker {WORKER_ID} shutting down...")
+            executor.shutdown(wait=True)
             break
         except Exception as e:
-            print(f"❌ Error in main loop: {e}", flush=True)
+            log.error(f"❌ Error in main loop: {e}")
             time.sleep(POLL_INTERVAL)
 
-
 if __name__ == "__main__":
     main()
@@ -1,9 +1,14 @@
 """Evaluate user documents against grant requirements."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
-from .gemini_client import GeminiService, DocumentEvaluation
+from .gemini_client import get_gemini_service, DocumentEvaluation
 from src.database.documents import update_project_document
-from src.database.projects import update_project, get_project_by_id
+from src.database.projects import update_project, get_project_by_id, docs_with_text
+
+# Max documents evaluated in parallel (same knob as the evaluation handler)
+EVAL_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "8"))
 
 
 class DocumentEvaluator:
@@ -16,14 +21,39 @@ class DocumentEvaluator:
         Args:
             language: Language for AI responses ('et' or 'en')
         """
-        self.gemini = GeminiService(language)
+        self.gemini = get_gemini_service(language)
+
+    @property
+    def model_id(self) -> str:
+        """Model used for evaluations (part of the response cache key)."""
+        return self.gemini.model
+
+    def prime_requirements(self, requirements_text: str) -> Optional[str]:
+        """
+        Send the requirements prefix shared by all documents once.
+
+        Args:
+            requirements_text: Text of grant requirements
+
+        Returns:
+            Session handle for evaluate_document, or None if the prefix
+            is too small to cache (documents are then evaluated inline)
+        """
+        return self.gemini.create_requirements_cache(requirements_text)
+
+    def release_requirements(self, session: Optional[str]) -> None:
+        """Release a session returned by prime_requirements."""
+        if session:
+            self.gemini.delete_cache(session)
 
     def evaluate_document(
         self,
         document_id: str,
         document_text: str,
         document_name: str,
-        requirements_text: str
+        requirements_text: str,
+        session: Optional[str] = None,
+        fingerprint: Optional[str] = None
     ) -> Optional[DocumentEvaluation]:
         """
         Evaluate a single document.
@@ -33,6 +63,8 @@ class DocumentEvaluator:
             document_text: Extracted text content of the document
             document_name: Name of the document
             requirements_text: Text of grant requirements
+            session: Optional handle from prime_requirements
+            fingerprint: Optional input hash stored alongside the score
 
         Returns:
             DocumentEvaluation or None on error
@@ -44,26 +76,48 @@ class DocumentEvaluator:
         evaluation = self.gemini.evaluate_document(
             document_text=document_text,
             requirements_text=requirements_text,
-            document_name=document_name
+            document_name=document_name,
+            cached_requirements=session
         )
 
         if evaluation:
-            # Save evaluation to database
-            update_project_document(
-                document_id,
-                ai_evaluation=evaluation.model_dump(),
-                document_score=evaluation.score,
-                annotations=[ann.model_dump() for ann in evaluation.annotations],
-                comments={
-                    "summary": evaluation.summary,
-                    "strengths": evaluation.strengths,
-                    "weaknesses": evaluation.weaknesses,
-                    "recommendations": evaluation.recommendations
-                }
-            )
+            self.save_evaluation(document_id, evaluation, fingerprint)
 
         return evaluation
 
+    def save_evaluation(
+        self,
+        document_id: str,
+        evaluation: DocumentEvaluation,
+        fingerprint: Optional[str] = None
+    ) -> None:
+        """
+        Save an evaluation to the project_document record.
+
+        Args:
+            document_id: ID of the project_document record
+            evaluation: Evaluation to store
+            fingerprint: Optional input hash; lets unchanged documents
+                skip re-evaluation on the next run
+        """
+        extra = {}
+        if fingerprint:
+            extra = {"last_eval_hash": fingerprint, "last_eval_score": evaluation.score}
+
+        update_project_document(
+            document_id,
+            **extra,
+            ai_evaluation=evaluation.model_dump(),
+            document_score=evaluation.score,
+            annotations=[ann.model_dump() for ann in evaluation.annotations],
+            comments={
+                "summary": evaluation.summary,
+                "strengths": evaluation.strengths,
+                "weaknesses": evaluation.weaknesses,
+                "recommendations": evaluation.recommendations
+            }
+        )
+
     def evaluate_all_project_documents(
         self,
         project_id: str
@@ -84,26 +138,38 @@ class DocumentEvaluator:
         # Compile requirements text
         requirements_text = self._compile_requirements_text(project)
 
+        # Shared prefix is sent once and reused by later runs for this project
+        session = self.gemini.get_or_create_cached_context(project_id, requirements_text)
+
         evaluations = []
         total_score = 0
         evaluated_count = 0
 
-        # Evaluate each document
-        for doc in project.get("project_documents", []):
-            doc_text = doc.get("extracted_text", "")
-
-            if doc_text:
-                evaluation = self.evaluate_document(
-                    document_id=doc["id"],
-                    document_text=doc_text,
-                    document_name=doc["name"],
-                    requirements_text=requirements_text
-                )
-
-                if evaluation:
-                    evaluations.append(evaluation)
-                    total_score += evaluation.score
-                    evaluated_count += 1
+        # Documents are independent network round-trips, evaluate them concurrently.
+        # Aggregation happens here in the calling thread, so no lock is needed.
+        docs = docs_with_text(project)
+        if docs:
+            max_workers = max(1, min(EVAL_CONCURRENCY, len(docs)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        self.evaluate_document,
+                        document_id=doc["id"],
+                        document_text=doc["extracted_text"],
+                        document_name=doc["name"],
+                        requirements_text=requirements_text,
+                        session=session
+                    )
+                    for doc in docs
+                ]
+
+                # Collected in submission order so evaluations match document order
+                for future in futures:
+                    evaluation = future.result()
+                    if evaluation:
+                        evaluations.append(evaluation)
+                        total_score += evaluation.score
+                        evaluated_count += 1
 
         # Calculate overall score
         overall_score = None
@@ -127,7 +193,7 @@ class DocumentEvaluator:
         Returns:
             Compiled requirements text
         """
-        grant = project.get("grants", {})
+        grant = project.get("grants") or {}
         requirements = grant.get("grant_requirements", [])
 
         texts = []
@@ -1,14 +1,387 @@
 """Generate final application documents."""
 
-from typing import Dict, Any, Optional
-from .gemini_client import GeminiService
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from .gemini_client import get_gemini_service
+from src.database.projects import docs_with_text
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, Border, Side
 import io
 
+log = logging.getLogger(__name__)
+
+
+# Markdown table row: category | description | amount [| justification] [| ...]
+BUDGET_ROW_RE = re.compile(
+    r"^\|?\s*([^|]+?)\s*\|\s*([^|]*?)\s*\|\s*([^|]+?)\s*(?:\|\s*([^|]*?)\s*)?(?:\|.*)?$"
+)
+# Markdown table row: phase | activities | start [| end] [| deliverables] [| ...]
+TIMELINE_ROW_RE = re.compile(
+    r"^\|?\s*([^|]+?)\s*\|\s*([^|]*?)\s*\|\s*([^|]+?)\s*"
+    r"(?:\|\s*([^|]*?)\s*)?(?:\|\s*([^|]*?)\s*)?(?:\|.*)?$"
+)
+# Markdown table separator row, e.g. |---|:---:|
+TABLE_SEPARATOR_RE = re.compile(r"^[\s|:\-]+$")
+# Thousands separators, currency sign and (non-breaking) spaces in amounts
+AMOUNT_STRIP_TABLE = str.maketrans("", "", ",€ \u00a0")
+
+# Processes for CPU-bound DOCX assembly (python-docx holds the GIL while
+# building and zipping); 0 builds in the calling thread
+DOCX_BUILD_WORKERS = int(os.getenv("DOCX_BUILD_WORKERS", "0"))
+_docx_pool: Optional[ProcessPoolExecutor] = None
+_docx_pool_lock = threading.Lock()
+
+# XLSX styles shared by every sheet and call (openpyxl style objects are immutable)
+TITLE_FONT = Font(bold=True, size=14)
+TITLE_ALIGNMENT = Alignment(horizontal="center")
+HEADER_FONT = Font(bold=True, size=12)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+_THIN_SIDE = Side(style="thin")
+THIN_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
+# Markdown heading: "# Title" (level 1) or "## Title" and deeper (level 2)
+MD_HEADING_RE = re.compile(r"^(#+)\s*(.*)$", re.DOTALL)
+# Bold paragraph used as a heading: "**Title**" (extra asterisks stripped)
+BOLD_HEADING_RE = re.compile(r"^\*\*\**(.*?)\**\*\*$", re.DOTALL)
+# Bullet list item prefixes ("- item" / "* item"), for one str.startswith call
+BULLET_PREFIXES = ("- ", "* ")
+# Paragraph: consecutive lines with visible text; whitespace-only lines separate
+PARAGRAPH_RE = re.compile(r"[^\S\n]*\S[^\n]*(?:\n[^\S\n]*\S[^\n]*)*")
+
+
+def iter_paragraphs(text: str) -> Iterator[str]:
+    """
+    Yield the non-blank paragraphs of text, stripped.
+
+    Streams matches instead of materializing text.split("\\n\\n"). Lines
+    holding only whitespace (including CRLF blank lines) end a paragraph,
+    so no empty paragraphs come out.
+
+    Args:
+        text: Generated markdown-ish text
+
+    Yields:
+        Paragraph text without surrounding whitespace
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+    for match in PARAGRAPH_RE.finditer(text):
+        yield match.group().strip()
+
+
+def parse_amount(text: str) -> float:
+    """
+    Parse a budget amount such as "1 000 EUR", "1,000 €" or "1500".
+
+    Args:
+        text: Amount cell from a generated budget table
+
+    Returns:
+        The amount, or 0 if it isn't a number
+    """
+    try:
+        return float(text.translate(AMOUNT_STRIP_TABLE).replace("EUR", ""))
+    except ValueError:
+        return 0
+
+
+def classify_paragraph(para: str) -> Tuple[str, str, int]:
+    """
+    Classify a stripped paragraph of generated markdown.
+
+    Args:
+        para: Paragraph text (see iter_paragraphs)
+
+    Returns:
+        (kind, text, level): kind is 'heading' (text and level 1/2 set),
+        'bullets' or 'text' (text is the paragraph, level 0)
+    """
+    m = MD_HEADING_RE.match(para)
+    if m:
+        return "heading", m.group(2).strip(), 1 if len(m.group(1)) == 1 else 2
+    m = BOLD_HEADING_RE.match(para)
+    if m:
+        return "heading", m.group(1).strip(), 2
+    if para.startswith(BULLET_PREFIXES):
+        return "bullets", para, 0
+    return "text", para, 0
+
+
+def add_markdown_paragraphs(doc, content: str, bullets: bool = True) -> None:
+    """
+    Append generated markdown-ish content to a DOCX document.
+
+    Args:
+        doc: python-docx Document
+        content: Generated text with '#'/'**' headings and '-'/'*' bullets
+        bullets: Render bullet paragraphs as List Bullet items (otherwise
+            they are written as plain paragraphs)
+    """
+    for para in iter_paragraphs(content):
+        kind, text, level = classify_paragraph(para)
+        if kind == "heading":
+            doc.add_heading(text, level=level)
+        elif kind == "bullets" and bullets:
+            # iter_paragraphs never yields blank lines inside a paragraph
+            for line in para.splitlines():
+                line = line.strip()
+                if line.startswith(BULLET_PREFIXES):
+                    doc.add_paragraph(line[2:].lstrip(), style="List Bullet")
+                else:
+                    doc.add_paragraph(line)
+        else:
+            doc.add_paragraph(para)
+
+
+@lru_cache(maxsize=1)
+def _blank_template() -> bytes:
+    """Default python-docx template, serialized once per process."""
+    buffer = io.BytesIO()
+    Document().save(buffer)
+    return buffer.getvalue()
+
+
+def _new_document():
+    """Blank Document loaded from the cached template bytes (skips the package file read)."""
+    return Document(io.BytesIO(_blank_template()))
+
+
+def _add_title_block(doc, title: str, subtitle: Optional[str] = None) -> None:
+    """
+    Add the centered title, optional italic subtitle and spacer every DOCX starts with.
+
+    Args:
+        doc: python-docx Document
+        title: Title heading text
+        subtitle: Italic line under the title (omitted if None)
+    """
+    heading = doc.add_heading(title, 0)
+    heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    if subtitle is not None:
+        paragraph = doc.add_paragraph()
+        paragraph.add_run(subtitle).italic = True
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    doc.add_paragraph()  # Spacing
+
+
+def _cell(ws, value, font=None, alignment=None, border=None) -> WriteOnlyCell:
+    """Build a styled cell for a write-only worksheet row."""
+    cell = WriteOnlyCell(ws, value=value)
+    if font:
+        cell.font = font
+    if alignment:
+        cell.alignment = alignment
+    if border:
+        cell.border = border
+    return cell
+
+
+def compile_doc_texts(project: dict) -> Dict[str, str]:
+    """
+    Map document name to extracted text for a project's documents with text.
+
+    Computed once per task and shared by every generator instead of each
+    one walking project_documents again.
+
+    Args:
+        project: Project data with documents
+
+    Returns:
+        Dict of {document name: extracted text}
+    """
+    return {doc["name"]: doc["extracted_text"] for doc in docs_with_text(project)}
+
+
+def build_application_docx(
+    labels: Dict[str, str],
+    project_info: dict,
+    summary: Optional[str],
+    narrative: Optional[str],
+    doc_names: List[str]
+) -> io.BytesIO:
+    """
+    Assemble the application DOCX from generated sections.
+
+    Module-level and free of generator state so it can also run in a
+    worker process (see DOCX_BUILD_WORKERS).
+
+    Args:
+        labels: Localized labels (DocumentGenerator._i18n)
+        project_info: Project name, description and grant name
+        summary: Generated executive summary (skipped if empty)
+        narrative: Generated project narrative (skipped if empty)
+        doc_names: Names listed under supporting documents
+
+    Returns:
+        DOCX file buffer (positioned at start)
+    """
+
+    doc = _new_document()
+    _add_title_block(
+        doc, project_info["name"], f"{labels['application_for']}: {project_info['grant_name']}"
+    )
+
+    # Executive Summary
+    if summary:
+        doc.add_heading(labels["exec_summary"], level=1)
+        doc.add_paragraph(summary)
+
+    # Project Narrative
+    if narrative:
+        doc.add_heading(labels["narrative"], level=1)
+        # Same heading rules as every other generated DOCX (classify_paragraph)
+        add_markdown_paragraphs(doc, narrative, bullets=False)
+
+    # Add section for uploaded documents reference
+    doc.add_heading(labels["supporting_docs"], level=1)
+    doc.add_paragraph(labels["supporting_docs_intro"])
+
+    for doc_name in doc_names:
+        # The List Bullet style renders the bullet itself
+        doc.add_paragraph(doc_name, style="List Bullet")
+
+    # Save to an in-memory buffer; returned as-is to avoid a bytes copy
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+
+    return buffer
+
+
+def build_sections_docx(
+    labels: Dict[str, Any],
+    project_name: str,
+    grant_name: str,
+    sections: List[Tuple[str, str]]
+) -> io.BytesIO:
+    """
+    Assemble the application DOCX from pre-edited sections.
+
+    Module-level like build_application_docx so it can run in the DOCX
+    build pool; long section lists then no longer hold the worker's GIL.
+
+    Args:
+        labels: Localized labels (DocumentGenerator._i18n)
+        project_name: Name of the project
+        grant_name: Name of the grant
+        sections: (section_name, content) pairs in document order
+
+    Returns:
+        DOCX file buffer (positioned at start)
+    """
+    doc = _new_document()
+    _add_title_block(doc, project_name, f"{labels['application_for']}: {grant_name}")
+
+    # Add each section
+    for section_name, content in sections:
+        if not section_name:
+            continue
+
+        # Add section heading
+        doc.add_heading(section_name, level=1)
+
+        if content:
+            # Same heading/bullet rules as every other generated DOCX
+            add_markdown_paragraphs(doc, content)
+        else:
+            # Empty section placeholder
+            empty_para = doc.add_paragraph()
+            empty_run = empty_para.add_run(labels["no_content"])
+            empty_run.italic = True
+
+    # Save to an in-memory buffer; returned as-is to avoid a bytes copy
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+
+    return buffer
+
+
+def _get_docx_pool() -> ProcessPoolExecutor:
+    """Get the shared DOCX build process pool, starting it on first use."""
+    global _docx_pool
+    with _docx_pool_lock:
+        if _docx_pool is None:
+            # spawn: forking a process that already runs task threads is unsafe
+            _docx_pool = ProcessPoolExecutor(
+                max_workers=DOCX_BUILD_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _docx_pool
+
+
+# Localized labels and default rows for generated documents
+_I18N_EN: Dict[str, Any] = {
+    "application_for": "Application for",
+    "exec_summary": "Executive Summary",
+    "narrative": "Project Narrative",
+    "supporting_docs": "Supporting Documents",
+    "supporting_docs_intro": "The following documents are included with this application:",
+    "no_content": "[No content]",
+    "cover_letter": "Cover Letter",
+    "risk_analysis": "Risk Analysis",
+    "budget_sheet": "Budget",
+    "budget_headers": ("Category", "Description", "Amount (EUR)", "Justification"),
+    "budget_default_rows": (
+        ("Personnel", "Staff costs", 0, ""),
+        ("Equipment", "Equipment and materials", 0, ""),
+        ("Travel", "Travel and meetings", 0, ""),
+        ("Other", "Other direct costs", 0, ""),
+        ("Overhead", "Indirect costs", 0, ""),
+    ),
+    "total": "TOTAL",
+    "timeline_sheet": "Timeline",
+    "timeline_headers": ("Phase", "Activities", "Start", "End", "Deliverables"),
+    "timeline_default_rows": (
+        ("Initiation", "Project setup, team formation", "Month 1", "Month 1", "Project plan"),
+        ("Development", "Core development work", "Month 2", "Month 6", "Prototype"),
+        ("Testing", "Testing and validation", "Month 6", "Month 8", "Test results"),
+        ("Implementation", "Deployment and rollout", "Month 8", "Month 10", "Deployed system"),
+        ("Closeout", "Final reporting", "Month 10", "Month 12", "Final report"),
+    ),
+}
+_I18N_ET: Dict[str, Any] = {
+    "application_for": "Taotlus",
+    "exec_summary": "Kokkuvõte",
+    "narrative": "Projekti kirjeldus",
+    "supporting_docs": "Lisadokumendid",
+    "supporting_docs_intro": "Taotlusega on kaasatud järgmised dokumendid:",
+    "no_content": "[Sisu puudub]",
+    "cover_letter": "Kaaskiri",
+    "risk_analysis": "Riskianalüüs",
+    "budget_sheet": "Eelarve",
+    "budget_headers": ("Kategooria", "Kirjeldus", "Summa (EUR)", "Põhjendus"),
+    "budget_default_rows": (
+        ("Personal", "Tööjõukulud", 0, ""),
+        ("Seadmed", "Seadmed ja materjalid", 0, ""),
+        ("Reisid", "Reisi- ja koosolekukulud", 0, ""),
+        ("Muud", "Muud otsesed kulud", 0, ""),
+        ("Üldkulud", "Kaudsed kulud", 0, ""),
+    ),
+    "total": "KOKKU",
+    "timeline_sheet": "Ajakava",
+    "timeline_headers": ("Faas", "Tegevused", "Algus", "Lõpp", "Tulemid"),
+    "timeline_default_rows": (
+        ("Alustamine", "Projekti seadistamine, meeskonna moodustamine", "Kuu 1", "Kuu 1", "Projektiplaan"),
+        ("Arendus", "Põhiarendus", "Kuu 2", "Kuu 6", "Prototüüp"),
+        ("Testimine", "Testimine ja valideerimine", "Kuu 6", "Kuu 8", "Testitulemused"),
+        ("Rakendamine", "Juurutamine", "Kuu 8", "Kuu 10", "Juurutatud süsteem"),
+        ("Lõpetamine", "Lõpparuandlus", "Kuu 10", "Kuu 12", "Lõpparuanne"),
+    ),
+}
+
 
 class DocumentGenerator:
     """Generate final application documents."""
@@ -20,146 +393,163 @@ class DocumentGenerator:
         Args:
             language: Language for generated content ('et' or 'en')
         """
-        self.gemini = GeminiService(language)
+        self.gemini = get_gemini_service(language)
         self.language = language
 
-    def generate_application_docx(
+        # Localized labels, resolved once
+        self._i18n = _I18N_EN if language == "en" else _I18N_ET
+
+    def _extract_context(
         self,
         project: dict,
-        requirements_text: str
-    ) -> Optional[bytes]:
+        doc_texts: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
         """
-        Generate application DOCX file.
+        Build the (doc_texts, project_info) pair every generator prompts with.
 
         Args:
             project: Project data with documents
-            requirements_text: Grant requirements text
+            doc_texts: Precompiled {name: extracted_text}; compiled here if None
 
         Returns:
-            DOCX file as bytes or None on error
+            Tuple of (doc_texts, project_info)
         """
-        # Compile document texts
-        doc_texts = {}
-        for doc in project.get("project_documents", []):
-            if doc.get("extracted_text"):
-                doc_texts[doc["name"]] = doc["extracted_text"]
+        if doc_texts is None:
+            doc_texts = compile_doc_texts(project)
 
         project_info = {
             "name": project.get("name", ""),
             "description": project.get("description", ""),
-            "grant_name": project.get("grants", {}).get("name", "")
+            "grant_name": (project.get("grants") or {}).get("name", "")
         }
+        return doc_texts, project_info
 
-        # Generate content sections using AI
-        summary = self.gemini.generate_content(
-            project_info=project_info,
-            documents_text=doc_texts,
-            requirements_text=requirements_text,
-            content_type="summary"
-        )
+    def generate_application_docx(
+        self,
+        project: dict,
+        requirements_text: str,
+        doc_texts: Optional[Dict[str, str]] = None,
+        include_summary: bool = True,
+        include_narrative: bool = True
+    ) -> Optional[io.BytesIO]:
+        """
+        Generate application DOCX file.
 
-        narrative = self.gemini.generate_content(
-            project_info=project_info,
-            documents_text=doc_texts,
-            requirements_text=requirements_text,
-            content_type="narrative"
+        Args:
+            project: Project data with documents
+            requirements_text: Grant requirements text
+            doc_texts: Precompiled {name: extracted_text} (see compile_doc_texts)
+            include_summary: Generate the executive summary section
+            include_narrative: Generate the project narrative section (skipping
+                either one saves its Gemini call, e.g. for a quick preview)
+
+        Returns:
+            DOCX file buffer (positioned at start) or None on error
+        """
+        doc_texts, project_info = self._extract_context(project, doc_texts)
+
+        content_types = [
+            content_type
+            for content_type, included in (("summary", include_summary), ("narrative", include_narrative))
+            if included
+        ]
+        if not content_types:
+            return None
+
+        # Generate content sections using AI (independent calls, run concurrently)
+        generated = self.gemini.generate_content_batch(
+            project_info, doc_texts, requirements_text, content_types
         )
+        summary = generated.get("summary")
+        narrative = generated.get("narrative")
 
         if not summary and not narrative:
             return None
 
-        # Create DOCX document
-        doc = Document()
+        return self._build_application_docx(project_info, summary, narrative, doc_texts)
 
-        # Title
-        title = doc.add_heading(project_info["name"], 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    async def agenerate_application_docx(
+        self,
+        project: dict,
+        requirements_text: str,
+        doc_texts: Optional[Dict[str, str]] = None
+    ) -> Optional[io.BytesIO]:
+        """
+        Async variant of generate_application_docx.
 
-        # Subtitle with grant name
-        subtitle = doc.add_paragraph()
-        subtitle_run = subtitle.add_run(
-            f"Application for: {project_info['grant_name']}"
-        )
-        subtitle_run.italic = True
-        subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        Summary and narrative are awaited together on the event loop; the
+        CPU-bound DOCX build runs in a thread so the loop stays free for
+        other generations.
 
-        doc.add_paragraph()  # Spacing
+        Args:
+            project: Project data with documents
+            requirements_text: Grant requirements text
+            doc_texts: Precompiled {name: extracted_text} (see compile_doc_texts)
 
-        # Executive Summary
-        if summary:
-            doc.add_heading(
-                "Executive Summary" if self.language == "en" else "Kokkuvõte",
-                level=1
-            )
-            doc.add_paragraph(summary)
+        Returns:
+            DOCX file buffer (positioned at start) or None on error
+        """
+        doc_texts, project_info = self._extract_context(project, doc_texts)
 
-        # Project Narrative
-        if narrative:
-            doc.add_heading(
-                "Project Narrative" if self.language == "en" else "Projekti kirjeldus",
-                level=1
+        summary, narrative = await asyncio.gather(*(
+            self.gemini.agenerate_content(
+                project_info=project_info,
+                documents_text=doc_texts,
+                requirements_text=requirements_text,
+                content_type=content_type
             )
+            for content_type in ("summary", "narrative")
+        ))
 
-            # Split narrative into paragraphs
-            for para in narrative.split("\n\n"):
-                if para.strip():
-                    # Check if it's a heading (starts with # or **)
-                    if para.strip().startswith("#"):
-                        heading_text = para.strip().lstrip("#").strip()
-                        doc.add_heading(heading_text, level=2)
-                    elif para.strip().startswith("**") and para.strip().endswith("**"):
-                        heading_text = para.strip().strip("*").strip()
-                        doc.add_heading(heading_text, level=2)
-                    else:
-                        doc.add_paragraph(para.strip())
-
-        # Add section for uploaded documents reference
-        doc.add_heading(
-            "Supporting Documents" if self.language == "en" else "Lisadokumendid",
-            level=1
-        )
+        if not summary and not narrative:
+            return None
 
-        doc.add_paragraph(
-            "The following documents are included with this application:"
-            if self.language == "en"
-            else "Taotlusega on kaasatud järgmised dokumendid:"
+        return await asyncio.to_thread(
+            self._build_application_docx, project_info, summary, narrative, doc_texts
         )
 
-        for doc_name in doc_texts.keys():
-            doc.add_paragraph(f"• {doc_name}", style="List Bullet")
+    def _build_application_docx(
+        self,
+        project_info: dict,
+        summary: Optional[str],
+        narrative: Optional[str],
+        doc_texts: Dict[str, str]
+    ) -> io.BytesIO:
+        """
+        Assemble the application DOCX, in the process pool when enabled.
 
-        # Save to bytes
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
+        Args:
+            project_info: Project name, description and grant name
+            summary: Generated executive summary (skipped if empty)
+            narrative: Generated project narrative (skipped if empty)
+            doc_texts: {name: extracted_text}; names are listed as supporting documents
 
-        return buffer.getvalue()
+        Returns:
+            DOCX file buffer (positioned at start)
+        """
+        args = (self._i18n, project_info, summary, narrative, list(doc_texts))
+        if DOCX_BUILD_WORKERS > 0:
+            return _get_docx_pool().submit(build_application_docx, *args).result()
+        return build_application_docx(*args)
 
     def generate_budget_xlsx(
         self,
         project: dict,
-        requirements_text: str
-    ) -> Optional[bytes]:
+        requirements_text: str,
+        doc_texts: Optional[Dict[str, str]] = None
+    ) -> Optional[io.BytesIO]:
         """
         Generate budget XLSX file.
 
         Args:
             project: Project data with documents
             requirements_text: Grant requirements text
+            doc_texts: Precompiled {name: extracted_text} (see compile_doc_texts)
 
         Returns:
-            XLSX file as bytes or None on error
+            XLSX file buffer (positioned at start) or None on error
         """
-        # Compile document texts
-        doc_texts = {}
-        for doc in project.get("project_documents", []):
-            if doc.get("extracted_text"):
-                doc_texts[doc["name"]] = doc["extracted_text"]
-
-        project_info = {
-            "name": project.get("name", ""),
-            "description": project.get("description", "")
-        }
+        doc_texts, project_info = self._extract_context(project, doc_texts)
 
         # Generate budget content using AI
         budget_content = self.gemini.generate_content(
@@ -169,129 +559,83 @@ class DocumentGenerator:
             content_type="budget"
         )
 
-        # Create XLSX workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Budget" if self.language == "en" else "Eelarve"
-
-        # Styles
-        header_font = Font(bold=True, size=12)
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin")
-        )
-
-        # Title
-        ws.merge_cells("A1:D1")
-        ws["A1"] = f"Budget - {project_info['name']}"
-        ws["A1"].font = Font(bold=True, size=14)
-        ws["A1"].alignment = Alignment(horizontal="center")
-
-        # Headers
-        headers = ["Category", "Description", "Amount (EUR)", "Justification"]
-        if self.language == "et":
-            headers = ["Kategooria", "Kirjeldus", "Summa (EUR)", "Põhjendus"]
-
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = header_font
-            cell.alignment = header_alignment
-            cell.border = thin_border
-
-        # Parse budget content and add rows
-        row = 4
+        # Parse budget content into rows
+        budget_rows = []
         total = 0
 
         if budget_content:
-            # Try to parse structured content
-            lines = budget_content.split("\n")
-            for line in lines:
+            # Try to parse structured content (pipe-separated table rows)
+            for line in budget_content.split("\n"):
                 line = line.strip()
-                if not line or line.startswith("#") or line.startswith("---"):
+                if not line or line.startswith("#") or TABLE_SEPARATOR_RE.match(line):
                     continue
 
-                # Try to parse table row (pipe-separated)
-                if "|" in line:
-                    parts = [p.strip() for p in line.split("|") if p.strip()]
-                    if len(parts) >= 3 and not all(c in "-|" for c in line):
-                        category = parts[0] if len(parts) > 0 else ""
-                        description = parts[1] if len(parts) > 1 else ""
-                        amount_str = parts[2] if len(parts) > 2 else "0"
-                        justification = parts[3] if len(parts) > 3 else ""
-
-                        # Try to parse amount
-                        try:
-                            amount = float(
-                                amount_str.replace(",", "")
-                                .replace("€", "")
-                                .replace("EUR", "")
-                                .strip()
-                            )
-                        except ValueError:
-                            amount = 0
-
-                        if category and category.lower() not in ["category", "kategooria"]:
-                            ws.cell(row=row, column=1, value=category).border = thin_border
-                            ws.cell(row=row, column=2, value=description).border = thin_border
-                            ws.cell(row=row, column=3, value=amount).border = thin_border
-                            ws.cell(row=row, column=4, value=justification).border = thin_border
-                            total += amount
-                            row += 1
+                match = BUDGET_ROW_RE.match(line)
+                if not match:
+                    continue
+
+                category, description, amount_str, justification = match.groups()
+                justification = justification or ""
+
+                amount = parse_amount(amount_str)
+
+                if category.lower() not in ["category", "kategooria"]:
+                    budget_rows.append((category, description, amount, justification))
+                    total += amount
 
         # If no structured content, add placeholder rows
-        if row == 4:
-            default_categories = [
-                ("Personnel", "Staff costs", 0, ""),
-                ("Equipment", "Equipment and materials", 0, ""),
-                ("Travel", "Travel and meetings", 0, ""),
-                ("Other", "Other direct costs", 0, ""),
-                ("Overhead", "Indirect costs", 0, "")
-            ]
-            if self.language == "et":
-                default_categories = [
-                    ("Personal", "Tööjõukulud", 0, ""),
-                    ("Seadmed", "Seadmed ja materjalid", 0, ""),
-                    ("Reisid", "Reisi- ja koosolekukulud", 0, ""),
-                    ("Muud", "Muud otsesed kulud", 0, ""),
-                    ("Üldkulud", "Kaudsed kulud", 0, "")
-                ]
-
-            for cat, desc, amt, just in default_categories:
-                ws.cell(row=row, column=1, value=cat).border = thin_border
-                ws.cell(row=row, column=2, value=desc).border = thin_border
-                ws.cell(row=row, column=3, value=amt).border = thin_border
-                ws.cell(row=row, column=4, value=just).border = thin_border
-                row += 1
+        if not budget_rows:
+            budget_rows = self._i18n["budget_default_rows"]
 
-        # Total row
-        row += 1
-        ws.cell(row=row, column=1, value="TOTAL" if self.language == "en" else "KOKKU")
-        ws.cell(row=row, column=1).font = header_font
-        ws.cell(row=row, column=3, value=total)
-        ws.cell(row=row, column=3).font = header_font
+        # Create XLSX workbook in write-only mode: rows are streamed out in order
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(self._i18n["budget_sheet"])
 
-        # Adjust column widths
+        # Column widths and merges must be set before the first row is written
         ws.column_dimensions["A"].width = 20
         ws.column_dimensions["B"].width = 40
         ws.column_dimensions["C"].width = 15
         ws.column_dimensions["D"].width = 40
+        ws.merged_cells.add("A1:D1")
+
+        # Title
+        ws.append([_cell(
+            ws,
+            f"Budget - {project_info['name']}",
+            font=TITLE_FONT,
+            alignment=TITLE_ALIGNMENT
+        )])
+        ws.append([])
+
+        ws.append([
+            _cell(ws, h, HEADER_FONT, HEADER_ALIGNMENT, THIN_BORDER)
+            for h in self._i18n["budget_headers"]
+        ])
+
+        for values in budget_rows:
+            ws.append([_cell(ws, value, border=THIN_BORDER) for value in values])
 
-        # Save to bytes
+        # Total row
+        ws.append([])
+        ws.append([
+            _cell(ws, self._i18n["total"], font=HEADER_FONT),
+            None,
+            _cell(ws, total, font=HEADER_FONT)
+        ])
+
+        # Save to an in-memory buffer; returned as-is to avoid a bytes copy
         buffer = io.BytesIO()
         wb.save(buffer)
         buffer.seek(0)
 
-        return buffer.getvalue()
+        return buffer
 
     def generate_docx_from_sections(
         self,
         project_name: str,
         grant_name: str,
         sections: list
-    ) -> Optional[bytes]:
+    ) -> Optional[io.BytesIO]:
         """
         Generate final DOCX from pre-edited sections.
 
@@ -301,115 +645,66 @@ class DocumentGenerator:
             sections: List of section dicts with 'section_name' and 'content'
 
         Returns:
-            DOCX file as bytes or None on error
+            DOCX file buffer (positioned at start) or None on error
         """
         try:
-            doc = Document()
-
-            # Title
-            title = doc.add_heading(project_name, 0)
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-            # Subtitle with grant name
-            subtitle = doc.add_paragraph()
-            subtitle_run = subtitle.add_run(
-                f"Taotlus: {grant_name}" if self.language == "et"
-                else f"Application for: {grant_name}"
+            # Only name/content cross into a pool process, not whole section rows
+            args = (
+                self._i18n,
+                project_name,
+                grant_name,
+                [(section.get("section_name", ""), section.get("content", "")) for section in sections],
             )
-            subtitle_run.italic = True
-            subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-            doc.add_paragraph()  # Spacing
+            if DOCX_BUILD_WORKERS > 0:
+                return _get_docx_pool().submit(build_sections_docx, *args).result()
+            return build_sections_docx(*args)
+        except Exception:
+            log.exception("Error generating DOCX from sections")
+            return None
 
-            # Add each section
-            for section in sections:
-                section_name = section.get("section_name", "")
-                content = section.get("content", "")
+    async def agenerate_docx_from_sections(
+        self,
+        project_name: str,
+        grant_name: str,
+        sections: list
+    ) -> Optional[io.BytesIO]:
+        """
+        Async variant of generate_docx_from_sections.
 
-                if not section_name:
-                    continue
+        The whole build runs in a thread (or the DOCX build pool), so large
+        section lists never block the event loop.
 
-                # Add section heading
-                doc.add_heading(section_name, level=1)
-
-                if content:
-                    # Split content into paragraphs and process
-                    for para in content.split("\n\n"):
-                        para = para.strip()
-                        if not para:
-                            continue
-
-                        # Check if it's a subheading (starts with ## or **)
-                        if para.startswith("##"):
-                            heading_text = para.lstrip("#").strip()
-                            doc.add_heading(heading_text, level=2)
-                        elif para.startswith("**") and para.endswith("**"):
-                            heading_text = para.strip("*").strip()
-                            doc.add_heading(heading_text, level=2)
-                        elif para.startswith("- ") or para.startswith("* "):
-                            # Handle bullet points
-                            lines = para.split("\n")
-                            for line in lines:
-                                line = line.strip()
-                                if line.startswith("- ") or line.startswith("* "):
-                                    bullet_text = line[2:].strip()
-                                    doc.add_paragraph(bullet_text, style="List Bullet")
-                                elif line:
-                                    doc.add_paragraph(line)
-                        else:
-                            # Regular paragraph - handle single newlines as line breaks
-                            paragraph = doc.add_paragraph()
-                            lines = para.split("\n")
-                            for i, line in enumerate(lines):
-                                if i > 0:
-                                    paragraph.add_run("\n")
-                                paragraph.add_run(line.strip())
-                else:
-                    # Empty section placeholder
-                    empty_para = doc.add_paragraph()
-                    empty_run = empty_para.add_run(
-                        "[Sisu puudub]" if self.language == "et"
-                        else "[No content]"
-                    )
-                    empty_run.italic = True
-
-            # Save to bytes
-            buffer = io.BytesIO()
-            doc.save(buffer)
-            buffer.seek(0)
+        Args:
+            project_name: Name of the project
+            grant_name: Name of the grant
+            sections: List of section dicts with 'section_name' and 'content'
 
-            return buffer.getvalue()
-        except Exception as e:
-            print(f"Error generating DOCX from sections: {e}")
-            return None
+        Returns:
+            DOCX file buffer (positioned at start) or None on error
+        """
+        return await asyncio.to_thread(
+            self.generate_docx_from_sections, project_name, grant_name, sections
+        )
 
     def generate_cover_letter_docx(
         self,
         project: dict,
-        requirements_text: str
-    ) -> Optional[bytes]:
+        requirements_text: str,
+        doc_texts: Optional[Dict[str, str]] = None
+    ) -> Optional[io.BytesIO]:
         """
         Generate a formal cover letter DOCX.
 
         Args:
             project: Project data with documents
             requirements_text: Grant requirements text
+            doc_texts: Precompiled {name: extracted_text} (see compile_doc_texts)
 
         Returns:
-            DOCX file as bytes or None on error
+            DOCX file buffer (positioned at start) or None on error
         """
         try:
-            # Compile document texts
-            doc_texts = {}
-            for doc in project.get("project_documents", []):
-                if doc.get("extracted_text"):
-                    doc_texts[doc["name"]] = doc["extracted_text"]
-
-            project_info = {
-                "name": project.get("name", ""),
-                "description": project.get("description", ""),
-                "grant_name": project.get("grants", {}).get("name", "")
-            }
+            doc_texts, project_info = self._extract_context(project, doc_texts)
 
             # Generate cover letter content using AI
             content = self.gemini.generate_content(
@@ -422,60 +717,42 @@ class DocumentGenerator:
             if not content:
                 return None
 
-            # Create DOCX document
-            doc = Document()
-
-            # Title
-            title = doc.add_heading(
-                "Kaaskiri" if self.language == "et" else "Cover Letter",
-                0
-            )
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-            doc.add_paragraph()  # Spacing
+            doc = _new_document()
+            _add_title_block(doc, self._i18n["cover_letter"])
 
             # Add the cover letter content
-            for para in content.split("\n\n"):
-                if para.strip():
-                    doc.add_paragraph(para.strip())
+            for para in iter_paragraphs(content):
+                doc.add_paragraph(para)
 
-            # Save to bytes
+            # Save to an in-memory buffer; returned as-is to avoid a bytes copy
             buffer = io.BytesIO()
             doc.save(buffer)
             buffer.seek(0)
 
-            return buffer.getvalue()
-        except Exception as e:
-            print(f"Error generating cover letter: {e}")
+            return buffer
+        except Exception:
+            log.exception("Error generating cover letter")
             return None
 
     def generate_executive_summary_docx(
         self,
         project: dict,
-        requirements_text: str
-    ) -> Optional[bytes]:
+        requirements_text: str,
+        doc_texts: Optional[Dict[str, str]] = None
+    ) -> Optional[io.BytesIO]:
         """
         Generate an executive summary DOCX.
 
         Args:
             project: Project data with documents
             requirements_text: Grant requirements text
+            doc_texts: Precompiled {name: extracted_text} (see compile_doc_texts)
 
         Returns:
-            DOCX file as bytes or None on error
+            DOCX file buffer (positioned at start) or None on error
         """
         try:
-            # Compile document texts
-            doc_texts = {}
-            for doc in project.get("project_documents", []):
-                if doc.get("extracted_text"):
-                    doc_texts[doc["name"]] = doc["extracted_text"]
-
-            project_info = {
-                "name": project.get("name", ""),
-                "description": project.get("description", ""),
-                "grant_name": project.get("grants", {}).get("name", "")
-            }
+            doc_texts, project_info = self._extract_context(project, doc_texts)
 
             # Generate executive summary content using AI
             content = self.gemini.generate_content(
@@ -488,79 +765,41 @@ class DocumentGenerator:
             if not content:
                 return None
 
-            # Create DOCX document
-            doc = Document()
-
-            # Title
-            title = doc.add_heading(
-                "Kokkuvõte" if self.language == "et" else "Executive Summary",
-                0
-            )
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-            # Subtitle with project name
-            subtitle = doc.add_paragraph()
-            subtitle_run = subtitle.add_run(project_info["name"])
-            subtitle_run.italic = True
-            subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-            doc.add_paragraph()  # Spacing
+            doc = _new_document()
+            _add_title_block(doc, self._i18n["exec_summary"], project_info["name"])
 
             # Add the summary content with heading support
-            for para in content.split("\n\n"):
-                para = para.strip()
-                if not para:
-                    continue
-
-                # Check if it's a heading
-                if para.startswith("##"):
-                    heading_text = para.lstrip("#").strip()
-                    doc.add_heading(heading_text, level=2)
-                elif para.startswith("#"):
-                    heading_text = para.lstrip("#").strip()
-                    doc.add_heading(heading_text, level=1)
-                elif para.startswith("**") and para.endswith("**"):
-                    heading_text = para.strip("*").strip()
-                    doc.add_heading(heading_text, level=2)
-                else:
-                    doc.add_paragraph(para)
+            add_markdown_paragraphs(doc, content, bullets=False)
 
-            # Save to bytes
+            # Save to an in-memory buffer; returned as-is to avoid a bytes copy
             buffer = io.BytesIO()
             doc.save(buffer)
             buffer.seek(0)
 
-            return buffer.getvalue()
-        except Exception as e:
-            print(f"Error generating executive summary: {e}")
+            return buffer
+        except Exception:
+            log.exception("Error generating executive summary")
             return None
 
     def generate_timeline_xlsx(
         self,
         project: dict,
-        requirements_text: str
-    ) -> Optional[bytes]:
+        requirements_text: str,
+        doc_texts: Optional[Dict[str, str]] = None
+    ) -> Optional[io.BytesIO]:
         """
         Generate a project timeline XLSX.
 
         Args:
             project: Project data with documents
             requirements_text: Grant requirements text
+            doc_texts: Precompiled {name: extracted_text} (see compile_doc_texts)
 
         Returns:
-            XLSX file as bytes or None on error
+            XLSX file buffer (positioned at start) or None on error
         """
         try:
-            # Compile document texts
-            doc_texts = {}
-            for doc in project.get("project_documents", []):
-                if doc.get("extracted_text"):
-                    doc_texts[doc["name"]] = doc["extracted_text"]
-
-            project_info = {
-                "name": project.get("name", ""),
-                "description": project.get("description", "")
-            }
+            doc_texts, project_info = self._extract_context(project, doc_texts)
 
             # Generate timeline content using AI
             timeline_content = self.gemini.generate_content(
@@ -570,139 +809,90 @@ class DocumentGenerator:
                 content_type="timeline"
             )
 
-            # Create XLSX workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Ajakava" if self.language == "et" else "Timeline"
-
-            # Styles
-            header_font = Font(bold=True, size=12)
-            header_alignment = Alignment(horizontal="center", vertical="center")
-            thin_border = Border(
-                left=Side(style="thin"),
-                right=Side(style="thin"),
-                top=Side(style="thin"),
-                bottom=Side(style="thin")
-            )
-
-            # Title
-            ws.merge_cells("A1:E1")
-            ws["A1"] = f"{'Ajakava' if self.language == 'et' else 'Timeline'} - {project_info['name']}"
-            ws["A1"].font = Font(bold=True, size=14)
-            ws["A1"].alignment = Alignment(horizontal="center")
-
-            # Headers
-            headers = ["Phase", "Activities", "Start", "End", "Deliverables"]
-            if self.language == "et":
-                headers = ["Faas", "Tegevused", "Algus", "Lõpp", "Tulemid"]
-
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=3, column=col, value=header)
-                cell.font = header_font
-                cell.alignment = header_alignment
-                cell.border = thin_border
-
-            # Parse timeline content and add rows
-            row = 4
+            # Parse timeline content into rows
+            timeline_rows = []
 
             if timeline_content:
                 lines = timeline_content.split("\n")
                 for line in lines:
                     line = line.strip()
-                    if not line or line.startswith("#") or line.startswith("---"):
+                    if not line or line.startswith("#") or TABLE_SEPARATOR_RE.match(line):
                         continue
 
-                    # Try to parse table row (pipe-separated)
-                    if "|" in line:
-                        parts = [p.strip() for p in line.split("|") if p.strip()]
-                        if len(parts) >= 3 and not all(c in "-|" for c in line):
-                            phase = parts[0] if len(parts) > 0 else ""
-                            activities = parts[1] if len(parts) > 1 else ""
-                            start = parts[2] if len(parts) > 2 else ""
-                            end = parts[3] if len(parts) > 3 else ""
-                            deliverables = parts[4] if len(parts) > 4 else ""
-
-                            # Skip header row
-                            if phase.lower() in ["phase", "faas"]:
-                                continue
-
-                            ws.cell(row=row, column=1, value=phase).border = thin_border
-                            ws.cell(row=row, column=2, value=activities).border = thin_border
-                            ws.cell(row=row, column=3, value=start).border = thin_border
-                            ws.cell(row=row, column=4, value=end).border = thin_border
-                            ws.cell(row=row, column=5, value=deliverables).border = thin_border
-                            row += 1
+                    match = TIMELINE_ROW_RE.match(line)
+                    if not match:
+                        continue
+
+                    phase, activities, start, end, deliverables = (g or "" for g in match.groups())
+
+                    # Skip header row
+                    if phase.lower() in ["phase", "faas"]:
+                        continue
+
+                    timeline_rows.append((phase, activities, start, end, deliverables))
 
             # If no structured content, add placeholder rows
-            if row == 4:
-                default_phases = [
-                    ("Initiation", "Project setup, team formation", "Month 1", "Month 1", "Project plan"),
-                    ("Development", "Core development work", "Month 2", "Month 6", "Prototype"),
-                    ("Testing", "Testing and validation", "Month 6", "Month 8", "Test results"),
-                    ("Implementation", "Deployment and rollout", "Month 8", "Month 10", "Deployed system"),
-                    ("Closeout", "Final reporting", "Month 10", "Month 12", "Final report")
-                ]
-                if self.language == "et":
-                    default_phases = [
-                        ("Alustamine", "Projekti seadistamine, meeskonna moodustamine", "Kuu 1", "Kuu 1", "Projektiplaan"),
-                        ("Arendus", "Põhiarendus", "Kuu 2", "Kuu 6", "Prototüüp"),
-                        ("Testimine", "Testimine ja valideerimine", "Kuu 6", "Kuu 8", "Testitulemused"),
-                        ("Rakendamine", "Juurutamine", "Kuu 8", "Kuu 10", "Juurutatud süsteem"),
-                        ("Lõpetamine", "Lõpparuandlus", "Kuu 10", "Kuu 12", "Lõpparuanne")
-                    ]
-
-                for phase, activities, start, end, deliverables in default_phases:
-                    ws.cell(row=row, column=1, value=phase).border = thin_border
-                    ws.cell(row=row, column=2, value=activities).border = thin_border
-                    ws.cell(row=row, column=3, value=start).border = thin_border
-                    ws.cell(row=row, column=4, value=end).border = thin_border
-                    ws.cell(row=row, column=5, value=deliverables).border = thin_border
-                    row += 1
-
-            # Adjust column widths
+            if not timeline_rows:
+                timeline_rows = self._i18n["timeline_default_rows"]
+
+            # Create XLSX workbook in write-only mode: rows are streamed out in order
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet(self._i18n["timeline_sheet"])
+
+            # Column widths and merges must be set before the first row is written
             ws.column_dimensions["A"].width = 20
             ws.column_dimensions["B"].width = 40
             ws.column_dimensions["C"].width = 12
             ws.column_dimensions["D"].width = 12
             ws.column_dimensions["E"].width = 30
+            ws.merged_cells.add("A1:E1")
 
-            # Save to bytes
+            # Title
+            ws.append([_cell(
+                ws,
+                f"{self._i18n['timeline_sheet']} - {project_info['name']}",
+                font=TITLE_FONT,
+                alignment=TITLE_ALIGNMENT
+            )])
+            ws.append([])
+
+            ws.append([
+                _cell(ws, h, HEADER_FONT, HEADER_ALIGNMENT, THIN_BORDER)
+                for h in self._i18n["timeline_headers"]
+            ])
+
+            for values in timeline_rows:
+                ws.append([_cell(ws, value, border=THIN_BORDER) for value in values])
+
+            # Save to an in-memory buffer; returned as-is to avoid a bytes copy
             buffer = io.BytesIO()
             wb.save(buffer)
             buffer.seek(0)
 
-            return buffer.getvalue()
-        except Exception as e:
-            print(f"Error generating timeline: {e}")
+            return buffer
+        except Exception:
+            log.exception("Error generating timeline")
             return None
 
     def generate_risk_analysis_docx(
         self,
         project: dict,
-        requirements_text: str
-    ) -> Optional[bytes]:
+        requirements_text: str,
+        doc_texts: Optional[Dict[str, str]] = None
+    ) -> Optional[io.BytesIO]:
         """
         Generate a risk analysis DOCX.
 
         Args:
             project: Project data with documents
             requirements_text: Grant requirements text
+            doc_texts: Precompiled {name: extracted_text} (see compile_doc_texts)
 
         Returns:
-            DOCX file as bytes or None on error
+            DOCX file buffer (positioned at start) or None on error
         """
         try:
-            # Compile document texts
-            doc_texts = {}
-            for doc in project.get("project_documents", []):
-                if doc.get("extracted_text"):
-                    doc_texts[doc["name"]] = doc["extracted_text"]
-
-            project_info = {
-                "name": project.get("name", ""),
-                "description": project.get("description", ""),
-                "grant_name": project.get("grants", {}).get("name", "")
-            }
+            doc_texts, project_info = self._extract_context(project, doc_texts)
 
             # Generate risk analysis content using AI
             content = self.gemini.generate_content(
@@ -715,59 +905,18 @@ class DocumentGenerator:
             if not content:
                 return None
 
-            # Create DOCX document
-            doc = Document()
+            doc = _new_document()
+            _add_title_block(doc, self._i18n["risk_analysis"], project_info["name"])
 
-            # Title
-            title = doc.add_heading(
-                "Riskianalüüs" if self.language == "et" else "Risk Analysis",
-                0
-            )
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-            # Subtitle with project name
-            subtitle = doc.add_paragraph()
-            subtitle_run = subtitle.add_run(project_info["name"])
-            subtitle_run.italic = True
-            subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-            doc.add_paragraph()  # Spacing
-
-            # Add the risk analysis content with heading support
-            for para in content.split("\n\n"):
-                para = para.strip()
-                if not para:
-                    continue
-
-                # Check if it's a heading
-                if para.startswith("##"):
-                    heading_text = para.lstrip("#").strip()
-                    doc.add_heading(heading_text, level=2)
-                elif para.startswith("#"):
-                    heading_text = para.lstrip("#").strip()
-                    doc.add_heading(heading_text, level=1)
-                elif para.startswith("**") and para.endswith("**"):
-                    heading_text = para.strip("*").strip()
-                    doc.add_heading(heading_text, level=2)
-                elif para.startswith("- ") or para.startswith("* "):
-                    # Handle bullet points
-                    lines = para.split("\n")
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith("- ") or line.startswith("* "):
-                            bullet_text = line[2:].strip()
-                            doc.add_paragraph(bullet_text, style="List Bullet")
-                        elif line:
-                            doc.add_paragraph(line)
-                else:
-                    doc.add_paragraph(para)
+            # Add the risk analysis content with heading and bullet support
+            add_markdown_paragraphs(doc, content)
 
-            # Save to bytes
+            # Save to an in-memory buffer; returned as-is to avoid a bytes copy
             buffer = io.BytesIO()
             doc.save(buffer)
             buffer.seek(0)
 
-            return buffer.getvalue()
-        except Exception as e:
-            print(f"Error generating risk analysis: {e}")
+            return buffer
+        except Exception:
+            log.exception("Error generating risk analysis")
             return None
@@ -1,12 +1,70 @@
 """Document parsing using lightweight libraries (no heavy ML dependencies)."""
 
-from typing import Dict, Any, List
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, List, IO, Tuple
+import io
 import os
+import threading
+
+from docx import Document
+from openpyxl import load_workbook
+from PyPDF2 import PdfReader
+
+log = logging.getLogger(__name__)
+
+# pypdfium2 module, or None if not installed (optional: PDFs are then read with
+# PyPDF2). Resolved on the first PDF so its import isn't paid at module load.
+_UNRESOLVED = object()
+_PDF_BACKEND: Any = _UNRESOLVED
+# PDFium is not thread-safe: every call into it, including closing its
+# objects, must hold this lock
+_pdfium_lock = threading.Lock()
+
+# PDFs at least this large with no font (or object stream) markers in the raw
+# bytes are rejected as scanned without running a PDF parser
+SCANNED_PDF_MIN_BYTES = 100 * 1024
+_SCAN_CHUNK = 1 << 20
+# "/ObjStm" bodies are compressed and may hide font dictionaries
+_TEXT_PDF_MARKERS = (b"/Font", b"/ObjStm")
+
+# Budget for parsed results kept in memory by content hash (re-uploads of
+# the same file skip parsing), counted as characters of text + markdown.
+# Off by default: Render workers are memory-bound, and a cache miss costs
+# an extra read of the upload to hash it
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", "0"))
+
+
+def _get_pdfium():
+    """Get the pypdfium2 module, or None if it is not installed."""
+    global _PDF_BACKEND
+    if _PDF_BACKEND is _UNRESOLVED:
+        try:
+            import pypdfium2
+        except ImportError:
+            pypdfium2 = None
+        _PDF_BACKEND = pypdfium2
+    return _PDF_BACKEND
 
 
 class DocumentParser:
     """Parse documents using PyPDF2 and python-docx (lightweight)."""
 
+    def __init__(self):
+        """Initialize the parser and its extension -> handler table."""
+        self._handlers = {
+            ".pdf": self._parse_pdf,
+            ".docx": self._parse_docx,
+            ".doc": self._parse_docx,
+            ".xlsx": self._parse_xlsx,
+            ".xls": self._parse_xlsx,
+            ".txt": self._parse_txt,
+        }
+        self._cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+
     def parse_document(self, file_bytes: bytes, filename: str) -> Dict[str, Any]:
         """
         Parse a document and extract text content.
@@ -15,51 +73,196 @@ class DocumentParser:
             file_bytes: Raw file bytes
             filename: Original filename for extension detection
 
+        Returns:
+            Dict with 'text', 'markdown', 'metadata'
+        """
+        return self.parse_document_stream(io.BytesIO(file_bytes), filename)
+
+    def parse_document_stream(self, fh: IO[bytes], filename: str) -> Dict[str, Any]:
+        """
+        Parse a document from a seekable binary file object.
+
+        Lets callers hand over a spooled download instead of holding the
+        whole file in memory as bytes.
+
+        Args:
+            fh: Seekable binary file object positioned at the start
+            filename: Original filename for extension detection
+
         Returns:
             Dict with 'text', 'markdown', 'metadata'
         """
         ext = os.path.splitext(filename)[1].lower()
+        handler = self._handlers.get(ext)
+        if handler is None:
+            return self._unsupported(fh, filename)
+        if PARSE_CACHE_MAX_BYTES <= 0:
+            return handler(fh, filename)
 
-        if ext == ".pdf":
-            return self._parse_pdf(file_bytes, filename)
-        elif ext in [".docx", ".doc"]:
-            return self._parse_docx(file_bytes, filename)
-        elif ext in [".xlsx", ".xls"]:
-            return self._parse_xlsx(file_bytes, filename)
-        elif ext == ".txt":
-            return self._parse_txt(file_bytes, filename)
-        else:
-            return {
-                "text": "",
-                "markdown": "",
-                "metadata": {
-                    "error": "unsupported_format",
-                    "message": f"Unsupported file format: {ext}"
-                }
+        key = self._fingerprint(fh, ext)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            log.info(f"Parse cache hit: {filename}")
+            return {**cached, "metadata": dict(cached["metadata"])}
+
+        result = handler(fh, filename)
+        # Only successful parses are cached; a failure may be a truncated download
+        size = self._result_size(result)
+        if "error" not in result["metadata"] and size <= PARSE_CACHE_MAX_BYTES:
+            with self._cache_lock:
+                if key not in self._cache:
+                    self._cache[key] = result
+                    self._cache_bytes += size
+                while self._cache_bytes > PARSE_CACHE_MAX_BYTES:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cache_bytes -= self._result_size(evicted)
+            result = {**result, "metadata": dict(result["metadata"])}
+        return result
+
+    @staticmethod
+    def _result_size(result: Dict[str, Any]) -> int:
+        """Approximate size of a parse result for the cache budget."""
+        return len(result.get("text") or "") + len(result.get("markdown") or "")
+
+    def _fingerprint(self, fh: IO[bytes], ext: str) -> bytes:
+        """
+        Hash a document's contents for the parse cache.
+
+        Args:
+            fh: Seekable binary file object; its position is restored
+            ext: Lowercased extension (the same bytes parse differently per type)
+
+        Returns:
+            16-byte BLAKE2b digest
+        """
+        digest = hashlib.blake2b(ext.encode(), digest_size=16)
+        start = fh.tell()
+        for chunk in iter(lambda: fh.read(_SCAN_CHUNK), b""):
+            digest.update(chunk)
+        fh.seek(start)
+        return digest.digest()
+
+    def _unsupported(self, fh: IO[bytes], filename: str) -> Dict[str, Any]:
+        """Result for file extensions without a parser."""
+        ext = os.path.splitext(filename)[1].lower()
+        return {
+            "text": "",
+            "markdown": "",
+            "metadata": {
+                "error": "unsupported_format",
+                "message": f"Unsupported file format: {ext}"
             }
+        }
+
+    def _looks_scanned(self, fh: IO[bytes]) -> bool:
+        """
+        Cheap byte scan for PDFs that cannot contain extractable text.
+
+        Text needs fonts, so a large PDF whose raw bytes never mention
+        /Font is image-only. Files with object streams are never judged
+        this way, since their font dictionaries may be compressed.
+
+        Args:
+            fh: Seekable binary file object; its position is restored
+
+        Returns:
+            True if the PDF is large and certainly has no fonts
+        """
+        start = fh.tell()
+        size = 0
+        tail = b""
+        try:
+            while True:
+                chunk = fh.read(_SCAN_CHUNK)
+                if not chunk:
+                    return size >= SCANNED_PDF_MIN_BYTES
+                size += len(chunk)
+                # Keep a few bytes so markers split across chunks still match
+                window = tail + chunk
+                if any(marker in window for marker in _TEXT_PDF_MARKERS):
+                    return False
+                tail = chunk[-8:]
+        finally:
+            fh.seek(start)
+
+    def _extract_pdf_text_pdfium(self, pdfium, fh: IO[bytes]) -> Tuple[str, int]:
+        """
+        Extract PDF text with PDFium (C, much faster than PyPDF2).
+
+        Runs entirely under _pdfium_lock, and every page, text page and
+        document is closed explicitly before the lock is released, so no
+        PDFium finalizer runs later on another thread. PDFs from concurrent
+        tasks are therefore extracted one at a time.
 
-    def _parse_pdf(self, file_bytes: bytes, filename: str) -> Dict[str, Any]:
-        """Extract text from PDF using PyPDF2."""
+        Args:
+            pdfium: The pypdfium2 module (see _get_pdfium)
+            fh: Seekable binary file object positioned at the start
+
+        Returns:
+            Tuple of (text, page count)
+        """
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(fh)
+            try:
+                texts = []
+                for index in range(len(pdf)):
+                    page = pdf[index]
+                    try:
+                        textpage = page.get_textpage()
+                        try:
+                            texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+                        finally:
+                            textpage.close()
+                    finally:
+                        page.close()
+                return "\n".join(texts), len(texts)
+            finally:
+                pdf.close()
+
+    def _extract_pdf_text_pypdf2(self, fh: IO[bytes]) -> Tuple[str, int]:
+        """Extract PDF text with pure-Python PyPDF2."""
+        reader = PdfReader(fh)
+        # Walk the page tree once. Pages stay serial: they share the
+        # reader's stream (not thread-safe) and extract_text is pure
+        # Python, so threads would only contend for the GIL.
+        pages = list(reader.pages)
+        return "\n".join([page.extract_text() or "" for page in pages]), len(pages)
+
+    def _parse_pdf(self, fh: IO[bytes], filename: str) -> Dict[str, Any]:
+        """Extract text from PDF using PDFium if installed, else PyPDF2."""
         try:
-            import io
-            from PyPDF2 import PdfReader
+            text = None
+            pdfium = None
+            if self._looks_scanned(fh):
+                text = ""
+            else:
+                pdfium = _get_pdfium()
+
+            if pdfium is not None:
+                try:
+                    text, page_count = self._extract_pdf_text_pdfium(pdfium, fh)
+                    method = "pdfium"
+                except Exception as e:
+                    log.warning(f"PDFium extraction failed, retrying with PyPDF2: {e}")
+                    fh.seek(0)
 
-            reader = PdfReader(io.BytesIO(file_bytes))
-            text = "\n".join(
-                page.extract_text() or ""
-                for page in reader.pages
-            )
+            if text is None:
+                text, page_count = self._extract_pdf_text_pypdf2(fh)
+                method = "pypdf2"
 
             if text and len(text.strip()) > 100:
-                print(f"PDF extracted successfully: {filename}")
+                log.info(f"PDF extracted successfully: {filename}")
                 return {
                     "text": text,
                     "markdown": text,
-                    "metadata": {"method": "pypdf2", "pages": len(reader.pages)}
+                    "metadata": {"method": method, "pages": page_count}
                 }
 
             # Scanned PDF - reject it
-            print(f"Scanned PDF detected, skipping: {filename}")
+            log.info(f"Scanned PDF detected, skipping: {filename}")
             return {
                 "text": "",
                 "markdown": "",
@@ -70,23 +273,20 @@ class DocumentParser:
             }
 
         except Exception as e:
-            print(f"PDF extraction failed: {e}")
+            log.warning(f"PDF extraction failed: {e}")
             return {
                 "text": "",
                 "markdown": "",
                 "metadata": {"error": "parse_error", "message": str(e)}
             }
 
-    def _parse_docx(self, file_bytes: bytes, filename: str) -> Dict[str, Any]:
+    def _parse_docx(self, fh: IO[bytes], filename: str) -> Dict[str, Any]:
         """Extract text from Word document using python-docx."""
         try:
-            import io
-            from docx import Document
+            doc = Document(fh)
+            text = "\n".join([para.text for para in doc.paragraphs])
 
-            doc = Document(io.BytesIO(file_bytes))
-            text = "\n".join(para.text for para in doc.paragraphs)
-
-            print(f"Word doc extracted successfully: {filename}")
+            log.info(f"Word doc extracted successfully: {filename}")
             return {
                 "text": text,
                 "markdown": text,
@@ -94,60 +294,65 @@ class DocumentParser:
             }
 
         except Exception as e:
-            print(f"Word doc extraction failed: {e}")
+            log.warning(f"Word doc extraction failed: {e}")
             return {
                 "text": "",
                 "markdown": "",
                 "metadata": {"error": "parse_error", "message": str(e)}
             }
 
-    def _parse_xlsx(self, file_bytes: bytes, filename: str) -> Dict[str, Any]:
+    def _parse_xlsx(self, fh: IO[bytes], filename: str) -> Dict[str, Any]:
         """Extract text from Excel spreadsheet using openpyxl."""
         try:
-            import io
-            from openpyxl import load_workbook
-
-            wb = load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+            wb = load_workbook(fh, read_only=True, data_only=True)
             text_parts = []
 
-            for sheet_name in wb.sheetnames:
-                sheet = wb[sheet_name]
-                text_parts.append(f"=== Sheet: {sheet_name} ===")
-                for row in sheet.iter_rows(values_only=True):
-                    row_text = "\t".join(str(cell) if cell is not None else "" for cell in row)
-                    if row_text.strip():
-                        text_parts.append(row_text)
+            try:
+                sheet_names = wb.sheetnames
+                for sheet_name in sheet_names:
+                    sheet = wb[sheet_name]
+                    text_parts.append(f"=== Sheet: {sheet_name} ===")
+                    for row in sheet.iter_rows(values_only=True):
+                        # Most cells are text already; only other values need str()
+                        row_text = "\t".join([
+                            cell if type(cell) is str else "" if cell is None else str(cell)
+                            for cell in row
+                        ])
+                        if row_text.strip():
+                            text_parts.append(row_text)
+            finally:
+                # Read-only workbooks keep the archive open until closed
+                wb.close()
 
-            wb.close()
             text = "\n".join(text_parts)
 
-            print(f"Excel extracted successfully: {filename}")
+            log.info(f"Excel extracted successfully: {filename}")
             return {
                 "text": text,
                 "markdown": text,
-                "metadata": {"method": "openpyxl", "sheets": len(wb.sheetnames)}
+                "metadata": {"method": "openpyxl", "sheets": len(sheet_names)}
             }
 
         except Exception as e:
-            print(f"Excel extraction failed: {e}")
+            log.warning(f"Excel extraction failed: {e}")
             return {
                 "text": "",
                 "markdown": "",
                 "metadata": {"error": "parse_error", "message": str(e)}
             }
 
-    def _parse_txt(self, file_bytes: bytes, filename: str) -> Dict[str, Any]:
+    def _parse_txt(self, fh: IO[bytes], filename: str) -> Dict[str, Any]:
         """Extract text from plain text file."""
         try:
-            text = file_bytes.decode("utf-8", errors="ignore")
-            print(f"Text file extracted: {filename}")
+            text = fh.read().decode("utf-8", errors="ignore")
+            log.info(f"Text file extracted: {filename}")
             return {
                 "text": text,
                 "markdown": text,
                 "metadata": {"method": "plain_text"}
             }
         except Exception as e:
-            print(f"Text extraction failed: {e}")
+            log.warning(f"Text extraction failed: {e}")
             return {
                 "text": "",
                 "markdown": "",
@@ -155,8 +360,20 @@ class DocumentParser:
             }
 
 
-# Convenience function for simple text extraction
+# Shared parser for the convenience functions; its only state is the
+# lock-guarded parse cache, so one instance serves every thread
 _parser_instance = None
+_parser_lock = threading.Lock()
+
+
+def get_document_parser() -> DocumentParser:
+    """Get the shared DocumentParser, creating it on first use (thread-safe)."""
+    global _parser_instance
+    if _parser_instance is None:
+        with _parser_lock:
+            if _parser_instance is None:
+                _parser_instance = DocumentParser()
+    return _parser_instance
 
 
 def parse_document(file_bytes: bytes, filename: str) -> str:
@@ -170,9 +387,20 @@ def parse_document(file_bytes: bytes, filename: str) -> str:
     Returns:
         Extracted text content
     """
-    global _parser_instance
-    if _parser_instance is None:
-        _parser_instance = DocumentParser()
+    result = get_document_parser().parse_document(file_bytes, filename)
+    return result.get("text", "") or result.get("markdown", "")
 
-    result = _parser_instance.parse_document(file_bytes, filename)
+
+def parse_document_stream(fh: IO[bytes], filename: str) -> str:
+    """
+    Parse a document from a binary file object and return extracted text.
+
+    Args:
+        fh: Seekable binary file object
+        filename: Original filename
+
+    Returns:
+        Extracted text content
+    """
+    result = get_document_parser().parse_document_stream(fh, filename)
     return result.get("text", "") or result.get("markdown", "")
@@ -1,15 +1,57 @@
 """Gemini AI client for document analysis and generation."""
 
+import asyncio
+import logging
 from google import genai
 from google.genai import types
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+import hashlib
 import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from ..cache import response_cache
 from ..utils.secrets import get_gemini_api_key
-
-
+from .rate_limit import gemini_bucket, estimate_tokens
+
+log = logging.getLogger(__name__)
+
+# Gemini rejects context caches smaller than this (approximate, 4 chars/token)
+CONTEXT_CACHE_MIN_TOKENS = 4096
+CONTEXT_CACHE_TTL = "300s"
+# Upper bound on requirements text placed in a context cache
+CACHED_REQUIREMENTS_CHARS = 100000
+# Requirements text sent inline with each evaluation when no cache exists
+INLINE_REQUIREMENTS_CHARS = 5000
+# Bump when the evaluation prompt changes, so stored scores and cached
+# evaluations made with the old prompt stop matching
+EVAL_PROMPT_VERSION = "2"
+# Stop handing out a context cache this many seconds before it expires
+CONTEXT_CACHE_EXPIRY_MARGIN = 30
+
+# Long-lived context caches shared across GeminiService instances:
+# (model, language, key) -> (requirements sha256, cache name, expires at)
+_context_caches: Dict[Tuple[str, str, str], Tuple[str, str, float]] = {}
+# Uploads in progress: (registry key, requirements sha256) -> Future of the cache name
+_context_cache_uploads: Dict[Tuple[Tuple[str, str, str], str], Future] = {}
+_context_caches_lock = threading.Lock()
+
+# Bump when the content prompts or CONTENT_GENERATION_CONFIG change, so
+# cached generations made with the old prompts stop matching
+CONTENT_PROMPT_VERSION = "1"
+
+# Sampling settings for generate_content / agenerate_content
+CONTENT_GENERATION_CONFIG = types.GenerateContentConfig(
+    temperature=0.5,
+    max_output_tokens=4000
+)
+
+
+@lru_cache(maxsize=1)
 def get_gemini_client():
-    """Get Gemini client instance."""
+    """Get Gemini client instance (shared, so its HTTP pool is reused)."""
     api_key = get_gemini_api_key()
     return genai.Client(api_key=api_key)
 
@@ -134,6 +176,7 @@ class GeminiService:
         """
 
         try:
+            gemini_bucket.acquire(estimate_tokens(prompt))
             response = self.client.models.generate_content(
                 model=self.model,
                 contents=prompt,
@@ -146,7 +189,7 @@ class GeminiService:
 
             return ExtractedRequirements.model_validate_json(response.text)
         except Exception as e:
-            print(f"Error extracting requirements: {e}")
+            log.error(f"Error extracting requirements: {e}")
             return None
 
     def extract_output_documents(self, document_text: str) -> Optional[ExtractedOutputDocuments]:
@@ -199,6 +242,7 @@ class GeminiService:
         """
 
         try:
+            gemini_bucket.acquire(estimate_tokens(prompt))
             response = self.client.models.generate_content(
                 model=self.model,
                 contents=prompt,
@@ -211,27 +255,12 @@ class GeminiService:
 
             return ExtractedOutputDocuments.model_validate_json(response.text)
         except Exception as e:
-            print(f"Error extracting output documents: {e}")
+            log.error(f"Error extracting output documents: {e}")
             return None
 
-    def evaluate_document(
-        self,
-        document_text: str,
-        requirements_text: str,
-        document_name: str
-    ) -> Optional[DocumentEvaluation]:
-        """
-        Evaluate a user's document against grant requirements.
-
-        Args:
-            document_text: Text content of the document to evaluate
-            requirements_text: Text of grant requirements
-            document_name: Name of the document being evaluated
-
-        Returns:
-            DocumentEvaluation object or None on error
-        """
-        prompt = f"""
+    def _evaluation_prefix(self, requirements_text: str) -> str:
+        """Instructions and grant requirements shared by every document evaluation."""
+        return f"""
         {self._get_language_instruction()}
 
         You are an expert grant application evaluator.
@@ -249,9 +278,124 @@ class GeminiService:
 
         GRANT REQUIREMENTS:
         ---
-        {requirements_text[:5000]}
+        {requirements_text}
         ---
+        """
+
+    def create_requirements_cache(self, requirements_text: str) -> Optional[str]:
+        """
+        Upload the shared evaluation prefix once as a Gemini context cache.
+
+        Subsequent evaluate_document calls that pass the returned name only
+        send the per-document text. Since cached tokens are cheap, the full
+        requirements are cached instead of the inline prompt's truncated copy.
+
+        Args:
+            requirements_text: Text of grant requirements
+
+        Returns:
+            Cached content name, or None if the prefix is below the provider
+            minimum or caching failed (callers fall back to inline prompts)
+        """
+        prefix = self._evaluation_prefix(requirements_text[:CACHED_REQUIREMENTS_CHARS])
+        if len(prefix) // 4 < CONTEXT_CACHE_MIN_TOKENS:
+            return None
 
+        try:
+            cache = self.client.caches.create(
+                model=self.model,
+                config=types.CreateCachedContentConfig(
+                    contents=[types.Content(role="user", parts=[types.Part(text=prefix)])],
+                    ttl=CONTEXT_CACHE_TTL
+                )
+            )
+            return cache.name
+        except Exception as e:
+            log.error(f"Error creating requirements cache: {e}")
+            return None
+
+    def get_or_create_cached_context(self, key: str, requirements_text: str) -> Optional[str]:
+        """
+        Get a context cache for requirements_text, reusing one created earlier.
+
+        Unlike create_requirements_cache, the cache is kept after use and
+        shared by later calls with the same key and text until shortly
+        before its TTL runs out; it is never deleted explicitly. Concurrent
+        callers for the same key and text share a single upload.
+
+        Args:
+            key: Reuse key (e.g. project ID)
+            requirements_text: Text of grant requirements
+
+        Returns:
+            Cached content name, or None if caching isn't possible
+        """
+        text_hash = hashlib.sha256(requirements_text.encode("utf-8")).hexdigest()
+        registry_key = (self.model, self.language, key)
+
+        upload_key = (registry_key, text_hash)
+
+        with _context_caches_lock:
+            entry = _context_caches.get(registry_key)
+            if entry and entry[0] == text_hash and entry[2] - time.monotonic() > CONTEXT_CACHE_EXPIRY_MARGIN:
+                return entry[1]
+            # Another thread is already uploading this text: wait for it instead
+            upload = _context_cache_uploads.get(upload_key)
+            owner = upload is None
+            if owner:
+                upload = _context_cache_uploads[upload_key] = Future()
+
+        if not owner:
+            return upload.result()
+
+        # Uploaded outside the registry lock so one project's slow
+        # caches.create doesn't stall lookups for every other project
+        cache_name = None
+        try:
+            cache_name = self.create_requirements_cache(requirements_text)
+        finally:
+            now = time.monotonic()
+            with _context_caches_lock:
+                # Expired entries are never reused, so drop them while here
+                for stale in [k for k, v in _context_caches.items() if v[2] <= now]:
+                    del _context_caches[stale]
+                if cache_name:
+                    ttl_seconds = float(CONTEXT_CACHE_TTL.rstrip("s"))
+                    _context_caches[registry_key] = (text_hash, cache_name, now + ttl_seconds)
+                else:
+                    _context_caches.pop(registry_key, None)
+                del _context_cache_uploads[upload_key]
+            upload.set_result(cache_name)
+        return cache_name
+
+    def delete_cache(self, cache_name: str) -> None:
+        """Delete a context cache created by create_requirements_cache."""
+        try:
+            self.client.caches.delete(name=cache_name)
+        except Exception as e:
+            log.error(f"Error deleting requirements cache: {e}")
+
+    def evaluate_document(
+        self,
+        document_text: str,
+        requirements_text: str,
+        document_name: str,
+        cached_requirements: Optional[str] = None
+    ) -> Optional[DocumentEvaluation]:
+        """
+        Evaluate a user's document against grant requirements.
+
+        Args:
+            document_text: Text content of the document to evaluate
+            requirements_text: Text of grant requirements
+            document_name: Name of the document being evaluated
+            cached_requirements: Optional context cache name from
+                create_requirements_cache (requirements are then not resent)
+
+        Returns:
+            DocumentEvaluation object or None on error
+        """
+        document_prompt = f"""
         DOCUMENT TO EVALUATE ({document_name}):
         ---
         {document_text[:10000]}
@@ -260,31 +404,38 @@ class GeminiService:
         Evaluate this document comprehensively.
         """
 
+        if cached_requirements:
+            prompt = document_prompt
+        else:
+            prompt = self._evaluation_prefix(requirements_text[:INLINE_REQUIREMENTS_CHARS]) + document_prompt
+
         try:
+            gemini_bucket.acquire(estimate_tokens(prompt))
             response = self.client.models.generate_content(
                 model=self.model,
                 contents=prompt,
                 config=types.GenerateContentConfig(
                     response_mime_type="application/json",
                     response_schema=DocumentEvaluation,
-                    temperature=0.4
+                    temperature=0.4,
+                    cached_content=cached_requirements
                 )
             )
 
             return DocumentEvaluation.model_validate_json(response.text)
         except Exception as e:
-            print(f"Error evaluating document: {e}")
+            log.error(f"Error evaluating document: {e}")
             return None
 
-    def generate_content(
+    def _content_prompt(
         self,
         project_info: dict,
         documents_text: dict,
         requirements_text: str,
         content_type: str
-    ) -> Optional[str]:
+    ) -> str:
         """
-        Generate application content based on project documents.
+        Build the generation prompt for a content type.
 
         Args:
             project_info: Project metadata (name, description)
@@ -293,7 +444,7 @@ class GeminiService:
             content_type: Type of content to generate ('narrative', 'budget', 'summary')
 
         Returns:
-            Generated content string or None on error
+            Prompt text (unknown content types fall back to 'narrative')
         """
         docs_summary = "\n\n".join([
             f"=== {name} ===\n{text[:3000]}"
@@ -473,19 +624,158 @@ class GeminiService:
             """
         }
 
-        prompt = prompts.get(content_type, prompts["narrative"])
+        return prompts.get(content_type, prompts["narrative"])
+
+    def _content_cache_key(self, content_type: str, prompt: str) -> str:
+        """Response cache key for a generate_content call."""
+        return response_cache.make_key(
+            "generate_content", CONTENT_PROMPT_VERSION, self.model, content_type, prompt
+        )
+
+    def generate_content(
+        self,
+        project_info: dict,
+        documents_text: dict,
+        requirements_text: str,
+        content_type: str
+    ) -> Optional[str]:
+        """
+        Generate application content based on project documents.
+
+        Args:
+            project_info: Project metadata (name, description)
+            documents_text: Dict of document name -> extracted text
+            requirements_text: Grant requirements text
+            content_type: Type of content to generate ('narrative', 'budget', 'summary')
+
+        Returns:
+            Generated content string or None on error
+        """
+        prompt = self._content_prompt(project_info, documents_text, requirements_text, content_type)
+
+        # The prompt embeds every input (project, documents, requirements, language)
+        cache_key = self._content_cache_key(content_type, prompt)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached.decode("utf-8")
+        if response_cache.is_replay():
+            return None
 
         try:
+            gemini_bucket.acquire(estimate_tokens(prompt))
             response = self.client.models.generate_content(
                 model=self.model,
                 contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.5,
-                    max_output_tokens=4000
+                config=CONTENT_GENERATION_CONFIG
+            )
+
+            if response.text:
+                response_cache.put(cache_key, response.text.encode("utf-8"))
+            return response.text
+        except Exception as e:
+            log.error(f"Error generating content: {e}")
+            return None
+
+    def generate_content_batch(
+        self,
+        project_info: dict,
+        documents_text: dict,
+        requirements_text: str,
+        content_types: List[str]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Generate several content types for the same inputs concurrently.
+
+        The requests are independent, so wall time is the slowest call
+        rather than the sum.
+
+        Args:
+            project_info: Project metadata (name, description)
+            documents_text: Dict of document name -> extracted text
+            requirements_text: Grant requirements text
+            content_types: Content types to generate (see generate_content)
+
+        Returns:
+            Dict of content_type -> generated content (None on error)
+        """
+        if not content_types:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=len(content_types)) as executor:
+            futures = {
+                content_type: executor.submit(
+                    self.generate_content,
+                    project_info=project_info,
+                    documents_text=documents_text,
+                    requirements_text=requirements_text,
+                    content_type=content_type
                 )
+                for content_type in content_types
+            }
+            return {content_type: future.result() for content_type, future in futures.items()}
+
+    async def agenerate_content(
+        self,
+        project_info: dict,
+        documents_text: dict,
+        requirements_text: str,
+        content_type: str
+    ) -> Optional[str]:
+        """
+        Async variant of generate_content using the client's aio interface.
+
+        Many generations can wait on Gemini from one event loop thread
+        instead of holding a worker thread each.
+
+        Args:
+            project_info: Project metadata (name, description)
+            documents_text: Dict of document name -> extracted text
+            requirements_text: Grant requirements text
+            content_type: Type of content to generate ('narrative', 'budget', 'summary')
+
+        Returns:
+            Generated content string or None on error
+        """
+        prompt = self._content_prompt(project_info, documents_text, requirements_text, content_type)
+
+        # Shares cache entries with generate_content (SQLite lookups are local and fast)
+        cache_key = self._content_cache_key(content_type, prompt)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached.decode("utf-8")
+        if response_cache.is_replay():
+            return None
+
+        try:
+            # The rate limiter sleeps, so wait for it off the event loop
+            await asyncio.to_thread(gemini_bucket.acquire, estimate_tokens(prompt))
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=prompt,
+                config=CONTENT_GENERATION_CONFIG
             )
 
+            if response.text:
+                response_cache.put(cache_key, response.text.encode("utf-8"))
             return response.text
         except Exception as e:
-            print(f"Error generating content: {e}")
+            log.error(f"Error generating content: {e}")
             return None
+
+
+@lru_cache(maxsize=4)
+def get_gemini_service(language: str = "et") -> GeminiService:
+    """
+    Get the shared GeminiService for a language.
+
+    GeminiService holds no per-call state (model/language are fixed and
+    the genai client is thread-safe), so evaluators, generators and
+    extractors across tasks and threads can share one instance.
+
+    Args:
+        language: Language for responses ('et' or 'en')
+
+    Returns:
+        GeminiService instance
+    """
+    return GeminiService(language)
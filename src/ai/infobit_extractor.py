@@ -1,11 +1,15 @@
 """Infobit extractor - extracts values from documents to fill infobit fields."""
 
+import logging
 from typing import List, Dict, Any, Optional
 from google.genai import types
 from .gemini_client import get_gemini_client
+from .rate_limit import gemini_bucket, estimate_tokens
 from .models import DocumentExtraction, ExtractedInfobitValue
 from .document_parser import parse_document
 
+log = logging.getLogger(__name__)
+
 
 def extract_infobits_from_document(
     file_data: bytes,
@@ -31,20 +35,44 @@ def extract_infobits_from_document(
     # Parse document to extract text
     try:
         document_text = parse_document(file_data, file_name)
-        if not document_text:
-            print(f"Failed to extract text from {file_name}")
-            return None
     except Exception as e:
-        print(f"Error parsing document: {e}")
+        log.error(f"Error parsing document: {e}")
+        return None
+
+    return extract_infobits_from_text(document_text, file_name, empty_infobits, language)
+
+
+def extract_infobits_from_text(
+    document_text: str,
+    file_name: str,
+    empty_infobits: List[Dict[str, Any]],
+    language: str = "et"
+) -> Optional[DocumentExtraction]:
+    """
+    Map already-parsed document text to empty infobit fields.
+
+    Args:
+        document_text: Extracted document text
+        file_name: Name of the source file
+        empty_infobits: List of infobit records that need to be filled
+        language: Language for extraction ('et' or 'en')
+
+    Returns:
+        DocumentExtraction object or None on error
+    """
+    if not empty_infobits:
+        return None
+
+    if not document_text:
+        log.warning(f"Failed to extract text from {file_name}")
         return None
 
     # Build field descriptions for AI
-    fields_description = ""
-    for infobit in empty_infobits:
-        field_name = infobit.get("field_name", "")
-        field_label = infobit.get("field_label", "")
-        field_desc = infobit.get("field_description", "")
-        fields_description += f"- {field_name}: {field_label} - {field_desc}\n"
+    fields_description = "".join(
+        f"- {infobit.get('field_name', '')}: {infobit.get('field_label', '')} - "
+        f"{infobit.get('field_description', '')}\n"
+        for infobit in empty_infobits
+    )
 
     # Call AI to extract and map values
     client = get_gemini_client()
@@ -94,6 +122,7 @@ def extract_infobits_from_document(
     """
 
     try:
+        gemini_bucket.acquire(estimate_tokens(prompt))
         response = client.models.generate_content(
             model=model,
             contents=prompt,
@@ -106,7 +135,7 @@ def extract_infobits_from_document(
 
         return DocumentExtraction.model_validate_json(response.text)
     except Exception as e:
-        print(f"Error extracting infobits: {e}")
+        log.error(f"Error extracting infobits: {e}")
         return None
 
 
@@ -124,5 +153,5 @@ def extract_text_from_file(file_data: bytes, file_name: str) -> str:
     try:
         return parse_document(file_data, file_name)
     except Exception as e:
-        print(f"Error extracting text: {e}")
+        log.error(f"Error extracting text: {e}")
         return ""
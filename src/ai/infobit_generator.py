@@ -1,11 +1,15 @@
 """Infobit generator - generates required fields from grant requirements and examples."""
 
+import logging
 from typing import List, Dict, Any, Optional
 from google.genai import types
 from .gemini_client import get_gemini_client
+from .rate_limit import gemini_bucket, estimate_tokens
 from .models import GeneratedInfobits, InfobitDefinition
 from ..database.grants import get_grant_requirements, get_grant_examples
 
+log = logging.getLogger(__name__)
+
 
 def generate_infobits_for_grant(grant_id: str, language: str = "et") -> Optional[GeneratedInfobits]:
     """
@@ -20,22 +24,23 @@ def generate_infobits_for_grant(grant_id: str, language: str = "et") -> Optional
     """
     # Fetch grant requirements
     requirements = get_grant_requirements(grant_id)
-    requirements_text = ""
+    requirement_parts = []
     for req in requirements:
         checklist = req.get("extracted_checklist", {})
         if isinstance(checklist, dict):
             items = checklist.get("checklist", [])
             for item in items:
-                requirements_text += f"- {item.get('name', '')}: {item.get('description', '')}\n"
-        requirements_text += f"\nDocument: {req.get('name', '')}\n"
+                requirement_parts.append(f"- {item.get('name', '')}: {item.get('description', '')}\n")
+        requirement_parts.append(f"\nDocument: {req.get('name', '')}\n")
+    requirements_text = "".join(requirement_parts)
 
     # Fetch example documents
     examples = get_grant_examples(grant_id)
-    examples_text = ""
-    for ex in examples:
-        extracted = ex.get("extracted_text", "")
-        if extracted:
-            examples_text += f"\n=== Example: {ex.get('name', '')} ===\n{extracted[:3000]}\n"
+    examples_text = "".join(
+        f"\n=== Example: {ex.get('name', '')} ===\n{ex['extracted_text'][:3000]}\n"
+        for ex in examples
+        if ex.get("extracted_text")
+    )
 
     if not requirements_text and not examples_text:
         return None
@@ -92,6 +97,7 @@ def generate_infobits_for_grant(grant_id: str, language: str = "et") -> Optional
     """
 
     try:
+        gemini_bucket.acquire(estimate_tokens(prompt))
         response = client.models.generate_content(
             model=model,
             contents=prompt,
@@ -104,7 +110,7 @@ def generate_infobits_for_grant(grant_id: str, language: str = "et") -> Optional
 
         return GeneratedInfobits.model_validate_json(response.text)
     except Exception as e:
-        print(f"Error generating infobits: {e}")
+        log.error(f"Error generating infobits: {e}")
         return None
 
 
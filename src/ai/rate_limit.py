@@ -0,0 +1,78 @@
+"""Token-bucket rate limiting for Gemini API calls."""
+
+import os
+import threading
+import time
+
+# Account limits, split evenly between worker processes sharing the key.
+# Set GEMINI_RPM=0 to disable limiting.
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "1000"))
+GEMINI_TPM = int(os.getenv("GEMINI_TPM", "1000000"))
+GEMINI_EXECUTORS = int(os.getenv("GEMINI_EXECUTORS", "1"))
+
+
+class TokenBucket:
+    """Thread-safe request + token bucket limiter."""
+
+    def __init__(self, rpm: int, tpm: int, executors: int = 1):
+        """
+        Initialize the bucket, starting full.
+
+        Args:
+            rpm: Requests per minute allowed for the whole account
+            tpm: Tokens per minute allowed for the whole account
+            executors: Number of processes sharing the limits
+        """
+        executors = max(1, executors)
+        self.rpm = rpm / executors
+        self.tpm = tpm / executors
+        self.request_tokens = self.rpm
+        self.token_tokens = self.tpm
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Refill both buckets for the time elapsed since last update."""
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.request_tokens = min(self.rpm, self.request_tokens + elapsed * self.rpm / 60)
+        self.token_tokens = min(self.tpm, self.token_tokens + elapsed * self.tpm / 60)
+
+    def acquire(self, estimated_tokens: int = 0) -> None:
+        """
+        Block until one request and estimated_tokens tokens are available.
+
+        Args:
+            estimated_tokens: Estimated prompt tokens for the call
+        """
+        if self.rpm <= 0:
+            return
+
+        # A single call larger than the bucket must still go through eventually
+        estimated_tokens = min(max(0, estimated_tokens), self.tpm)
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self.request_tokens >= 1 and self.token_tokens >= estimated_tokens:
+                    self.request_tokens -= 1
+                    self.token_tokens -= estimated_tokens
+                    return
+
+                wait = max(
+                    (1 - self.request_tokens) * 60 / self.rpm,
+                    (estimated_tokens - self.token_tokens) * 60 / self.tpm if self.tpm > 0 else 0
+                )
+
+            # Sleep outside the lock so other threads can refill/check
+            time.sleep(max(wait, 0.01))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about 4 characters per token)."""
+    return len(text) // 4
+
+
+# Shared by every Gemini call site in this process
+gemini_bucket = TokenBucket(GEMINI_RPM, GEMINI_TPM, GEMINI_EXECUTORS)
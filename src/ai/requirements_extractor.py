@@ -1,11 +1,14 @@
 """Extract and process grant requirements."""
 
+import logging
 from typing import Optional, List, Dict, Any
-from .gemini_client import GeminiService, ExtractedRequirements, ExtractedOutputDocuments
-from .document_parser import DocumentParser
+from .gemini_client import get_gemini_service, ExtractedRequirements, ExtractedOutputDocuments
+from .document_parser import get_document_parser
 from src.database.grants import update_grant_requirement, bulk_create_grant_output_documents
 from src.storage.supabase_storage import download_file
 
+log = logging.getLogger(__name__)
+
 
 class RequirementsExtractor:
     """Extract and process grant requirements from documents."""
@@ -17,8 +20,8 @@ class RequirementsExtractor:
         Args:
             language: Language for AI responses ('et' or 'en')
         """
-        self.gemini = GeminiService(language)
-        self.parser = DocumentParser()
+        self.gemini = get_gemini_service(language)
+        self.parser = get_document_parser()
 
     def process_requirement_document(
         self,
@@ -38,7 +41,7 @@ class RequirementsExtractor:
         # Download file from storage
         file_data = download_file("grant-requirements", file_path)
         if not file_data:
-            print(f"Could not download file: {file_path}")
+            log.warning(f"Could not download file: {file_path}")
             return None
 
         # Get filename from path
@@ -49,7 +52,7 @@ class RequirementsExtractor:
         text = parsed.get("text", "")
 
         if not text:
-            print(f"Could not extract text from: {filename}")
+            log.warning(f"Could not extract text from: {filename}")
             return None
 
         # Extract requirements using AI
@@ -95,7 +98,7 @@ class RequirementsExtractor:
         # Download file from storage
         file_data = download_file("grant-requirements", file_path)
         if not file_data:
-            print(f"Could not download file: {file_path}")
+            log.warning(f"Could not download file: {file_path}")
             return None
 
         # Get filename from path
@@ -106,7 +109,7 @@ class RequirementsExtractor:
         text = parsed.get("text", "")
 
         if not text:
-            print(f"Could not extract text from: {filename}")
+            log.warning(f"Could not extract text from: {filename}")
             return None
 
         # Extract output documents using AI
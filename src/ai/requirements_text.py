@@ -0,0 +1,97 @@
+"""Compile grant requirements into prompt text (shared by task handlers)."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Compiled texts kept per grant version
+REQUIREMENTS_CACHE_SIZE = 256
+
+_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _text(value: Any) -> str:
+    """Prompt text for a nullable field: None becomes "", anything else str()."""
+    return "" if value is None else str(value)
+
+
+def compile_requirements_text(
+    requirements: List[Dict[str, Any]],
+    include_checklist: bool = True
+) -> str:
+    """
+    Compile grant requirements into a markdown-ish prompt section.
+
+    Args:
+        requirements: grant_requirements records
+        include_checklist: Whether to include extracted checklist items
+
+    Returns:
+        Compiled requirements text
+    """
+    parts = []
+    for req in requirements:
+        parts.extend(("\n## ", _text(req.get("name")), "\n", _text(req.get("description")), "\n"))
+        if not include_checklist:
+            continue
+        for item in req.get("extracted_checklist") or []:
+            if isinstance(item, dict):
+                parts.extend((
+                    "- ", _text(item.get("name")), ": ", _text(item.get("description")), "\n"
+                ))
+            else:
+                parts.extend(("- ", _text(item), "\n"))
+    return "".join(parts)
+
+
+def _cache_key(
+    grant: Dict[str, Any],
+    requirements: List[Dict[str, Any]],
+    include_checklist: bool
+) -> Optional[Tuple]:
+    """
+    Cache key for a grant's compiled text, or None if it cannot be versioned.
+
+    Requirement edits (e.g. checklist extraction) don't touch the grant row,
+    so each requirement's own updated_at is part of the key too.
+    """
+    if not grant.get("id") or not grant.get("updated_at"):
+        return None
+    stamps = tuple((req.get("id"), req.get("updated_at")) for req in requirements)
+    if any(not req_id or not updated_at for req_id, updated_at in stamps):
+        return None
+    return (grant["id"], grant["updated_at"], stamps, include_checklist)
+
+
+def get_requirements_text(grant: Dict[str, Any], include_checklist: bool = True) -> str:
+    """
+    Get compiled requirements text for a grant record with grant_requirements.
+
+    Cached in-process by grant and requirement updated_at, so the records
+    themselves are never serialized just to build a key.
+
+    Args:
+        grant: Grant record (as embedded in get_project_by_id)
+        include_checklist: Whether to include extracted checklist items
+
+    Returns:
+        Compiled requirements text
+    """
+    requirements = grant.get("grant_requirements") or []
+    key = _cache_key(grant, requirements, include_checklist)
+    if key is None:
+        return compile_requirements_text(requirements, include_checklist)
+
+    with _cache_lock:
+        text = _cache.get(key)
+        if text is not None:
+            _cache.move_to_end(key)
+            return text
+
+    text = compile_requirements_text(requirements, include_checklist)
+    with _cache_lock:
+        _cache[key] = text
+        if len(_cache) > REQUIREMENTS_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return text
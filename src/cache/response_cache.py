@@ -0,0 +1,165 @@
+"""Content-addressed cache for AI responses and generated files.
+
+Entries are keyed by a SHA256 of everything that determines the output
+(prompt inputs, model, language), so re-running a task with unchanged
+inputs becomes a local lookup instead of a Gemini API call. Old and
+excess entries are pruned (RESPONSE_CACHE_MAX_AGE_DAYS,
+RESPONSE_CACHE_MAX_ENTRIES) so the file stays bounded.
+"""
+
+import logging
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Union
+
+log = logging.getLogger(__name__)
+
+# Cache modes (EVAL_CACHE_MODE):
+#   enabled   - serve hits, store new responses
+#   read-only - serve hits, never store
+#   replay    - serve hits, never call the API on a miss
+#   disabled  - bypass the cache entirely
+CACHE_MODES = ["enabled", "read-only", "replay", "disabled"]
+CACHE_MODE = os.getenv("EVAL_CACHE_MODE", "enabled")
+CACHE_PATH = os.getenv(
+    "RESPONSE_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "grantwriter_response_cache.sqlite3")
+)
+
+# Bounds on the cache file: entries older than this many days, and all but
+# the newest RESPONSE_CACHE_MAX_ENTRIES, are pruned (0 disables either bound)
+CACHE_MAX_AGE_DAYS = float(os.getenv("RESPONSE_CACHE_MAX_AGE_DAYS", "7"))
+CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+# Seconds between prunes in a long-lived process
+CACHE_PRUNE_INTERVAL = 3600
+
+# sqlite3 connections can't be shared across threads, keep one per thread
+_local = threading.local()
+
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+
+def get_cache_mode() -> str:
+    """Get the configured cache mode (falls back to 'enabled' if invalid)."""
+    if CACHE_MODE in CACHE_MODES:
+        return CACHE_MODE
+    return "enabled"
+
+
+def is_replay() -> bool:
+    """Whether API calls must be skipped on a cache miss."""
+    return get_cache_mode() == "replay"
+
+
+def make_key(*parts: str) -> str:
+    """
+    Build a cache key from the inputs that determine a response.
+
+    Args:
+        *parts: Prompt inputs, model id, language, etc.
+
+    Returns:
+        Hex SHA256 digest
+    """
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Get (or open) this thread's cache connection."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(CACHE_PATH, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, payload BLOB NOT NULL, created_at TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS response_cache_created_at ON response_cache (created_at)"
+        )
+        _local.conn = conn
+        _maybe_prune(conn)
+    return conn
+
+
+def _maybe_prune(conn: sqlite3.Connection) -> None:
+    """Prune expired and excess entries, at most once per CACHE_PRUNE_INTERVAL."""
+    global _last_prune
+    with _prune_lock:
+        now = time.monotonic()
+        if _last_prune and now - _last_prune < CACHE_PRUNE_INTERVAL:
+            return
+        _last_prune = now
+
+    try:
+        with conn:
+            if CACHE_MAX_AGE_DAYS > 0:
+                cutoff = datetime.now(timezone.utc) - timedelta(days=CACHE_MAX_AGE_DAYS)
+                conn.execute(
+                    "DELETE FROM response_cache WHERE created_at < ?", (cutoff.isoformat(),)
+                )
+            if CACHE_MAX_ENTRIES > 0:
+                conn.execute(
+                    "DELETE FROM response_cache WHERE key IN ("
+                    "SELECT key FROM response_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (CACHE_MAX_ENTRIES,)
+                )
+    except Exception as e:
+        log.error(f"Error pruning response cache: {e}")
+
+
+def get(key: str) -> Optional[bytes]:
+    """
+    Look up a cached payload.
+
+    Args:
+        key: Cache key from make_key()
+
+    Returns:
+        Cached payload or None on miss (always None when disabled)
+    """
+    if get_cache_mode() == "disabled":
+        return None
+
+    try:
+        row = _get_connection().execute(
+            "SELECT payload FROM response_cache WHERE key = ?", (key,)
+        ).fetchone()
+        return bytes(row[0]) if row else None
+    except Exception as e:
+        log.error(f"Error reading response cache: {e}")
+        return None
+
+
+def put(key: str, payload: Union[bytes, memoryview]) -> bool:
+    """
+    Store a payload (no-op unless mode is 'enabled').
+
+    Args:
+        key: Cache key from make_key()
+        payload: Serialized response or file content (any bytes-like object)
+
+    Returns:
+        True if stored
+    """
+    if get_cache_mode() != "enabled":
+        return False
+
+    try:
+        conn = _get_connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, payload, created_at) VALUES (?, ?, ?)",
+                (key, payload, datetime.now(timezone.utc).isoformat())
+            )
+        _maybe_prune(conn)
+        return True
+    except Exception as e:
+        log.error(f"Error writing response cache: {e}")
+        return False
@@ -1,9 +1,12 @@
 """AI usage tracking database operations."""
 
+import logging
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from .connection import get_db
 
+log = logging.getLogger(__name__)
+
 # Gemini pricing (per 1M tokens) - approximate as of 2024
 PRICING = {
     "gemini-2.0-flash": {"input": 0.075, "output": 0.30},
@@ -64,7 +67,7 @@ def log_ai_usage(
         result = db.table("ai_usage").insert(data).execute()
         return result.data[0] if result.data else None
     except Exception as e:
-        print(f"Error logging AI usage: {e}")
+        log.error(f"Error logging AI usage: {e}")
         return None
 
 
@@ -74,7 +77,7 @@ def get_user_usage_summary(
 ) -> Dict[str, Any]:
     """Get usage summary for a user over the past N days."""
     db = get_db()
-    since = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
 
     try:
         result = db.table("ai_usage").select("*").eq("user_id", user_id).gte("created_at", since).execute()
@@ -100,7 +103,7 @@ def get_user_usage_summary(
             "by_operation": by_operation
         }
     except Exception as e:
-        print(f"Error getting user usage: {e}")
+        log.error(f"Error getting user usage: {e}")
         return {
             "total_requests": 0,
             "total_input_tokens": 0,
@@ -129,7 +132,7 @@ def get_project_usage_summary(project_id: str) -> Dict[str, Any]:
             "total_cost_usd": total_cost
         }
     except Exception as e:
-        print(f"Error getting project usage: {e}")
+        log.error(f"Error getting project usage: {e}")
         return {
             "total_requests": 0,
             "total_input_tokens": 0,
@@ -141,7 +144,7 @@ def get_project_usage_summary(project_id: str) -> Dict[str, Any]:
 def get_all_users_usage(days: int = 30) -> List[Dict[str, Any]]:
     """Get usage summary for all users (admin view)."""
     db = get_db()
-    since = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
 
     try:
         # Get all usage records
@@ -167,14 +170,14 @@ def get_all_users_usage(days: int = 30) -> List[Dict[str, Any]]:
 
         return list(by_user.values())
     except Exception as e:
-        print(f"Error getting all users usage: {e}")
+        log.error(f"Error getting all users usage: {e}")
         return []
 
 
 def get_total_usage(days: int = 30) -> Dict[str, Any]:
     """Get total usage across all users."""
     db = get_db()
-    since = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
 
     try:
         result = db.table("ai_usage").select("input_tokens, output_tokens, cost_usd").gte("created_at", since).execute()
@@ -187,7 +190,7 @@ def get_total_usage(days: int = 30) -> Dict[str, Any]:
             "total_cost_usd": sum(float(r.get("cost_usd", 0)) for r in records)
         }
     except Exception as e:
-        print(f"Error getting total usage: {e}")
+        log.error(f"Error getting total usage: {e}")
         return {
             "total_requests": 0,
             "total_input_tokens": 0,
@@ -1,11 +1,49 @@
 """Supabase database connection utilities (worker version - no streamlit)."""
 
+import logging
+import os
+import threading
+import httpx
 from supabase import create_client, Client
 from typing import Optional
 from ..utils.secrets import get_supabase_url, get_supabase_key
 
+log = logging.getLogger(__name__)
+
 # Module-level client cache
 _db_client: Optional[Client] = None
+_db_lock = threading.Lock()
+
+# Keep-alive pool shared by every PostgREST call (progress updates, claims, handlers)
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "40"))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "20"))
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "30"))
+
+
+def _pool_postgrest(client: Client) -> None:
+    """
+    Swap the PostgREST HTTP session for one with an explicit keep-alive pool.
+
+    The transport retries failed connection attempts, so a dropped idle
+    socket doesn't surface as a failed query.
+
+    Args:
+        client: Supabase client to patch in place
+    """
+    postgrest = client.postgrest
+    old_session = postgrest.session
+    limits = httpx.Limits(
+        max_connections=SUPABASE_MAX_CONNECTIONS,
+        max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+        keepalive_expiry=60
+    )
+    postgrest.session = httpx.Client(
+        base_url=old_session.base_url,
+        headers=old_session.headers,
+        timeout=SUPABASE_TIMEOUT,
+        transport=httpx.HTTPTransport(limits=limits, retries=3)
+    )
+    old_session.close()
 
 
 def get_db() -> Client:
@@ -18,13 +56,43 @@ def get_db() -> Client:
     global _db_client
 
     if _db_client is None:
-        url = get_supabase_url()
-        key = get_supabase_key()
-        _db_client = create_client(url, key)
+        with _db_lock:
+            if _db_client is None:
+                client = create_client(get_supabase_url(), get_supabase_key())
+                try:
+                    _pool_postgrest(client)
+                except Exception as e:
+                    log.warning(f"Could not configure PostgREST connection pool: {e}")
+                _db_client = client
 
     return _db_client
 
 
+def reset_db(failed: Optional[Client] = None) -> Client:
+    """
+    Drop the cached client and build a fresh one.
+
+    Used after repeated connection errors, when pooled sockets may all
+    be dead. The old client is not closed: other task threads (and the
+    db handed to handlers) may still be using it, so it is left to the
+    garbage collector once they let go.
+
+    Args:
+        failed: Client the caller saw failing; if another thread already
+            replaced it, that replacement is kept instead of rebuilding again
+
+    Returns:
+        Current Supabase client instance
+    """
+    global _db_client
+
+    with _db_lock:
+        if failed is None or _db_client is failed:
+            _db_client = None
+
+    return get_db()
+
+
 def execute_query(query, ttl: Optional[str] = None):
     """
     Execute a database query.
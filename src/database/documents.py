@@ -1,27 +1,39 @@
 """Document database operations."""
 
+import logging
 from .connection import get_db
+from .retry import retry_db_operation
 from typing import List, Dict, Any, Optional
 
+log = logging.getLogger(__name__)
 
-def get_project_documents(project_id: str) -> List[Dict[str, Any]]:
+
+# Columns the evaluation pipeline reads; skips ai_evaluation/annotations blobs
+PROJECT_DOCUMENT_COLUMNS = "id, name, file_path, extracted_text, last_eval_hash, last_eval_score"
+
+
+def get_project_documents(
+    project_id: str,
+    columns: str = PROJECT_DOCUMENT_COLUMNS
+) -> List[Dict[str, Any]]:
     """
     Get all documents for a project.
 
     Args:
         project_id: Project UUID
+        columns: Columns to select (pass "*" for full records)
 
     Returns:
         List of document records
     """
     try:
         db = get_db()
-        response = db.table("project_documents").select("*").eq(
+        response = db.table("project_documents").select(columns).eq(
             "project_id", project_id
         ).order("created_at", desc=True).execute()
         return response.data or []
     except Exception as e:
-        print(f"Error fetching project documents: {e}")
+        log.error(f"Error fetching project documents: {e}")
         return []
 
 
@@ -85,10 +97,19 @@ def create_project_document(
         response = db.table("project_documents").insert(data).execute()
         return response.data[0] if response.data else None
     except Exception as e:
-        print(f"Error creating project document: {e}")
+        log.error(f"Error creating project document: {e}")
         return None
 
 
+@retry_db_operation()
+def _update_project_document(document_id: str, data: Dict[str, Any]):
+    """Run the project_documents update (retried on transient errors)."""
+    db = get_db()
+    return db.table("project_documents").update(data).eq(
+        "id", document_id
+    ).execute()
+
+
 def update_project_document(document_id: str, **kwargs) -> Optional[Dict[str, Any]]:
     """
     Update a project document.
@@ -101,13 +122,10 @@ def update_project_document(document_id: str, **kwargs) -> Optional[Dict[str, An
         Updated document record or None
     """
     try:
-        db = get_db()
-        response = db.table("project_documents").update(kwargs).eq(
-            "id", document_id
-        ).execute()
+        response = _update_project_document(document_id, kwargs)
         return response.data[0] if response.data else None
     except Exception as e:
-        print(f"Error updating project document: {e}")
+        log.error(f"Error updating project document: {e}")
         return None
 
 
@@ -146,14 +164,39 @@ def get_project_results(project_id: str) -> List[Dict[str, Any]]:
         ).order("generated_at", desc=True).execute()
         return response.data or []
     except Exception as e:
-        print(f"Error fetching project results: {e}")
+        log.error(f"Error fetching project results: {e}")
         return []
 
 
+def get_latest_result(project_id: str, result_type: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the most recent result of a given type for a project.
+
+    Args:
+        project_id: Project UUID
+        result_type: Type of result (application_docx, budget_xlsx, etc.)
+
+    Returns:
+        Result record or None
+    """
+    try:
+        db = get_db()
+        response = db.table("project_results").select(
+            "id, file_path, content_sha256"
+        ).eq("project_id", project_id).eq(
+            "result_type", result_type
+        ).order("generated_at", desc=True).limit(1).execute()
+        return response.data[0] if response.data else None
+    except Exception as e:
+        log.error(f"Error fetching latest project result: {e}")
+        return None
+
+
 def create_project_result(
     project_id: str,
     result_type: str,
-    file_path: str
+    file_path: str,
+    content_sha256: Optional[str] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Create a new project result record.
@@ -162,20 +205,26 @@ def create_project_result(
         project_id: Project UUID
         result_type: Type of result (application_docx, budget_xlsx, etc.)
         file_path: Path to file in storage
+        content_sha256: Optional SHA-256 hex digest of the file content
+            (build timestamps excluded, see handlers.generation)
 
     Returns:
         Created result record or None
     """
     try:
         db = get_db()
-        response = db.table("project_results").insert({
+        data = {
             "project_id": project_id,
             "result_type": result_type,
             "file_path": file_path
-        }).execute()
+        }
+        if content_sha256:
+            data["content_sha256"] = content_sha256
+
+        response = db.table("project_results").insert(data).execute()
         return response.data[0] if response.data else None
     except Exception as e:
-        print(f"Error creating project result: {e}")
+        log.error(f"Error creating project result: {e}")
         return None
 
 
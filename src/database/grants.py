@@ -1,8 +1,11 @@
 """Grant database operations."""
 
+import logging
 from .connection import get_db
 from typing import List, Dict, Any, Optional
 
+log = logging.getLogger(__name__)
+
 
 def get_active_grants() -> List[Dict[str, Any]]:
     """
@@ -16,7 +19,7 @@ def get_active_grants() -> List[Dict[str, Any]]:
         response = db.table("grants").select("*").eq("is_active", True).order("name").execute()
         return response.data or []
     except Exception as e:
-        print(f"Error fetching grants: {e}")
+        log.error(f"Error fetching grants: {e}")
         return []
 
 
@@ -32,7 +35,7 @@ def get_all_grants() -> List[Dict[str, Any]]:
         response = db.table("grants").select("*, grant_requirements(*)").order("name").execute()
         return response.data or []
     except Exception as e:
-        print(f"Error fetching all grants: {e}")
+        log.error(f"Error fetching all grants: {e}")
         return []
 
 
@@ -105,7 +108,7 @@ def update_grant(grant_id: str, **kwargs) -> Optional[Dict[str, Any]]:
         response = db.table("grants").update(kwargs).eq("id", grant_id).execute()
         return response.data[0] if response.data else None
     except Exception as e:
-        print(f"Error updating grant: {e}")
+        log.error(f"Error updating grant: {e}")
         return None
 
 
@@ -144,7 +147,7 @@ def get_grant_requirements(grant_id: str) -> List[Dict[str, Any]]:
         ).order("sort_order").execute()
         return response.data or []
     except Exception as e:
-        print(f"Error fetching grant requirements: {e}")
+        log.error(f"Error fetching grant requirements: {e}")
         return []
 
 
@@ -189,7 +192,7 @@ def create_grant_requirement(
         response = db.table("grant_requirements").insert(data).execute()
         return response.data[0] if response.data else None
     except Exception as e:
-        print(f"Error creating requirement: {e}")
+        log.error(f"Error creating requirement: {e}")
         return None
 
 
@@ -209,7 +212,7 @@ def update_grant_requirement(requirement_id: str, **kwargs) -> Optional[Dict[str
         response = db.table("grant_requirements").update(kwargs).eq("id", requirement_id).execute()
         return response.data[0] if response.data else None
     except Exception as e:
-        print(f"Error updating requirement: {e}")
+        log.error(f"Error updating requirement: {e}")
         return None
 
 
@@ -288,7 +291,7 @@ def create_grant_example(
         response = db.table("grant_examples").insert(data).execute()
         return response.data[0] if response.data else None
     except Exception as e:
-        print(f"Error creating example: {e}")
+        log.error(f"Error creating example: {e}")
         return None
 
 
@@ -1,8 +1,11 @@
 """Infobits database operations."""
 
+import logging
 from .connection import get_db
 from typing import List, Dict, Any, Optional
 
+log = logging.getLogger(__name__)
+
 
 def create_infobits(project_id: str, infobits: List[Dict[str, Any]]) -> bool:
     """
@@ -36,7 +39,7 @@ def create_infobits(project_id: str, infobits: List[Dict[str, Any]]) -> bool:
             db.table("project_infobits").insert(records).execute()
         return True
     except Exception as e:
-        print(f"Error creating infobits: {e}")
+        log.error(f"Error creating infobits: {e}")
         return False
 
 
@@ -57,7 +60,7 @@ def get_project_infobits(project_id: str) -> List[Dict[str, Any]]:
         ).order("category").order("sort_order").execute()
         return response.data or []
     except Exception as e:
-        print(f"Error fetching infobits: {e}")
+        log.error(f"Error fetching infobits: {e}")
         return []
 
 
@@ -81,6 +84,13 @@ def get_infobits_by_category(project_id: str) -> Dict[str, List[Dict[str, Any]]]
     return grouped
 
 
+# Columns needed to describe an empty field to the AI and to write it back
+EMPTY_INFOBIT_COLUMNS = (
+    "id, project_id, field_name, field_label, field_label_en, "
+    "field_description, category, is_required, sort_order"
+)
+
+
 def get_empty_infobits(project_id: str) -> List[Dict[str, Any]]:
     """
     Get infobits that have no value filled.
@@ -89,16 +99,16 @@ def get_empty_infobits(project_id: str) -> List[Dict[str, Any]]:
         project_id: Project UUID
 
     Returns:
-        List of empty infobit records
+        List of empty infobit records (EMPTY_INFOBIT_COLUMNS only)
     """
     try:
         db = get_db()
-        response = db.table("project_infobits").select("*").eq(
+        response = db.table("project_infobits").select(EMPTY_INFOBIT_COLUMNS).eq(
             "project_id", project_id
         ).eq("value", "").order("category").order("sort_order").execute()
         return response.data or []
     except Exception as e:
-        print(f"Error fetching empty infobits: {e}")
+        log.error(f"Error fetching empty infobits: {e}")
         return []
 
 
@@ -135,7 +145,42 @@ def update_infobit(
         ).execute()
         return True
     except Exception as e:
-        print(f"Error updating infobit: {e}")
+        log.error(f"Error updating infobit: {e}")
+        return False
+
+
+def bulk_update_infobits(rows: List[Dict[str, Any]]) -> bool:
+    """
+    Update many infobit values in a single round-trip.
+
+    Runs the bulk_update_infobits RPC, which only writes value, source,
+    confidence and updated_at (like update_infobit, a None confidence
+    leaves the stored one untouched). Other columns edited while the
+    extraction ran are kept.
+
+    Args:
+        rows: Dicts with 'id', 'value', 'source' and optional 'confidence'
+
+    Returns:
+        True if successful
+    """
+    if not rows:
+        return True
+    try:
+        db = get_db()
+        records = [
+            {
+                "id": row["id"],
+                "value": row["value"],
+                "source": row["source"],
+                "confidence": row.get("confidence"),
+            }
+            for row in rows
+        ]
+        db.rpc("bulk_update_infobits", {"_rows": records}).execute()
+        return True
+    except Exception as e:
+        log.error(f"Error bulk updating infobits: {e}")
         return False
 
 
@@ -174,7 +219,7 @@ def update_infobit_by_field_name(
         ).eq("field_name", field_name).execute()
         return True
     except Exception as e:
-        print(f"Error updating infobit by field name: {e}")
+        log.error(f"Error updating infobit by field name: {e}")
         return False
 
 
@@ -208,7 +253,7 @@ def calculate_completion(project_id: str) -> int:
 
         return int((filled_count / required_count) * 100)
     except Exception as e:
-        print(f"Error calculating completion: {e}")
+        log.error(f"Error calculating completion: {e}")
         return 0
 
 
@@ -227,7 +272,7 @@ def delete_project_infobits(project_id: str) -> bool:
         db.table("project_infobits").delete().eq("project_id", project_id).execute()
         return True
     except Exception as e:
-        print(f"Error deleting infobits: {e}")
+        log.error(f"Error deleting infobits: {e}")
         return False
 
 
@@ -1,8 +1,11 @@
 """Project sharing database operations."""
 
+import logging
 from typing import List, Dict, Any, Optional
 from .connection import get_db
 
+log = logging.getLogger(__name__)
+
 
 def get_project_shares(project_id: str) -> List[Dict[str, Any]]:
     """
@@ -21,7 +24,7 @@ def get_project_shares(project_id: str) -> List[Dict[str, Any]]:
         ).eq("project_id", project_id).execute()
         return response.data or []
     except Exception as e:
-        print(f"Error getting project shares: {e}")
+        log.error(f"Error getting project shares: {e}")
         return []
 
 
@@ -42,7 +45,7 @@ def get_shared_projects_for_user(user_id: str) -> List[Dict[str, Any]]:
         ).eq("user_id", user_id).execute()
         return response.data or []
     except Exception as e:
-        print(f"Error getting shared projects: {e}")
+        log.error(f"Error getting shared projects: {e}")
         return []
 
 
@@ -69,7 +72,7 @@ def share_project(project_id: str, user_id: str, granted_by: str, access_level:
         }).execute()
         return True
     except Exception as e:
-        print(f"Error sharing project: {e}")
+        log.error(f"Error sharing project: {e}")
         return False
 
 
@@ -91,7 +94,7 @@ def revoke_project_access(project_id: str, user_id: str) -> bool:
         ).eq("user_id", user_id).execute()
         return True
     except Exception as e:
-        print(f"Error revoking access: {e}")
+        log.error(f"Error revoking access: {e}")
         return False
 
 
@@ -124,7 +127,7 @@ def has_project_access(project_id: str, user_id: str) -> bool:
 
         return bool(share.data)
     except Exception as e:
-        print(f"Error checking project access: {e}")
+        log.error(f"Error checking project access: {e}")
         return False
 
 
@@ -160,7 +163,7 @@ def get_access_level(project_id: str, user_id: str) -> Optional[str]:
 
         return None
     except Exception as e:
-        print(f"Error getting access level: {e}")
+        log.error(f"Error getting access level: {e}")
         return None
 
 
@@ -178,7 +181,7 @@ def get_all_projects_for_admin() -> List[Dict[str, Any]]:
         ).order("created_at", desc=True).execute()
         return response.data or []
     except Exception as e:
-        print(f"Error getting all projects: {e}")
+        log.error(f"Error getting all projects: {e}")
         return []
 
 
@@ -196,5 +199,5 @@ def get_all_users_for_admin() -> List[Dict[str, Any]]:
         ).order("email").execute()
         return response.data or []
     except Exception as e:
-        print(f"Error getting all users: {e}")
+        log.error(f"Error getting all users: {e}")
         return []
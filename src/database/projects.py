@@ -1,7 +1,32 @@
 """Project database operations (worker version - no streamlit)."""
 
+import logging
 from .connection import get_db
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+def docs_with_text(project: Dict[str, Any]) -> Tuple[Dict[str, Any], ...]:
+    """
+    Get the project's documents that have extracted text.
+
+    Uses the tuple attached by get_project_by_id when present, so the
+    filter runs once per load instead of once per consumer.
+
+    Args:
+        project: Project record with project_documents
+
+    Returns:
+        Tuple of document records with non-empty extracted_text
+    """
+    docs = project.get("_docs_with_text")
+    if docs is None:
+        docs = tuple(
+            doc for doc in project.get("project_documents") or ()
+            if doc.get("extracted_text")
+        )
+    return docs
 
 
 def get_project_by_id(project_id: str) -> Optional[Dict[str, Any]]:
@@ -19,6 +44,30 @@ def get_project_by_id(project_id: str) -> Optional[Dict[str, Any]]:
         response = db.table("projects").select(
             "*, grants(*, grant_requirements(*)), project_documents(*), project_results(*)"
         ).eq("id", project_id).single().execute()
+        project = response.data
+        if project:
+            # Immutable so tasks sharing the record can't alter it
+            project["_docs_with_text"] = docs_with_text(project)
+        return project
+    except Exception:
+        return None
+
+
+def get_project_with_requirements(project_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a project with its grant and requirements, without documents/results.
+
+    Args:
+        project_id: Project UUID
+
+    Returns:
+        Project record with grants, or None
+    """
+    try:
+        db = get_db()
+        response = db.table("projects").select(
+            "*, grants(*, grant_requirements(*))"
+        ).eq("id", project_id).single().execute()
         return response.data
     except Exception:
         return None
@@ -40,7 +89,7 @@ def update_project(project_id: str, **kwargs) -> Optional[Dict[str, Any]]:
         response = db.table("projects").update(kwargs).eq("id", project_id).execute()
         return response.data[0] if response.data else None
     except Exception as e:
-        print(f"Error updating project: {e}")
+        log.error(f"Error updating project: {e}")
         return None
 
 
@@ -71,5 +120,5 @@ def calculate_completion(project_id: str) -> int:
         filled = sum(1 for ib in required if ib.get("value"))
         return int((filled / len(required)) * 100)
     except Exception as e:
-        print(f"Error calculating completion: {e}")
+        log.error(f"Error calculating completion: {e}")
         return 0
@@ -0,0 +1,96 @@
+"""Retry helper for transient Supabase failures."""
+
+import logging
+import functools
+import random
+import time
+from typing import Callable, Optional, Tuple, Type, TypeVar
+
+import httpx
+
+from .connection import get_db, reset_db
+
+log = logging.getLogger(__name__)
+
+# Network-level failures worth retrying; API errors (bad column, RLS) are not
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (httpx.TransportError,)
+
+# Consecutive transient failures after which the client is rebuilt
+RECONNECT_AFTER = 2
+
+T = TypeVar("T")
+
+
+def retry_db(
+    fn: Callable[[], T],
+    *,
+    retries: int = 6,
+    base: float = 0.2,
+    cap: float = 10.0,
+    reconnect: bool = True,
+    name: Optional[str] = None
+) -> T:
+    """
+    Call fn, retrying transient errors with jittered exponential backoff.
+
+    fn should fetch the client with get_db() on every call so a retry
+    after reconnecting uses the new client.
+
+    Args:
+        fn: Zero-argument callable doing the DB operation
+        retries: Total attempts before the last error is re-raised
+        base: Delay before the first retry, doubled each attempt
+        cap: Upper bound on a single delay
+        reconnect: Rebuild the client (see reset_db) after repeated failures
+        name: Operation name for log messages (default fn.__name__)
+
+    Returns:
+        Whatever fn returns
+    """
+    for attempt in range(retries):
+        # The client this attempt runs against, so a reconnect only replaces it once
+        client = get_db() if reconnect else None
+        try:
+            return fn()
+        except TRANSIENT_ERRORS as e:
+            if attempt == retries - 1:
+                raise
+            if reconnect and attempt + 1 == RECONNECT_AFTER:
+                log.warning(f"Reconnecting to Supabase after error: {e}")
+                reset_db(client)
+            delay = min(cap, base * (2 ** attempt))
+            # Full jitter so parallel writers don't retry in lockstep
+            time.sleep(random.uniform(0, delay))
+            log.warning(f"Retrying {name or getattr(fn, '__name__', 'operation')} after error: {e}")
+
+
+def retry_db_operation(
+    retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 5.0
+) -> Callable:
+    """
+    Decorator retrying a DB call on transient errors with jittered backoff.
+
+    Args:
+        retries: Total attempts before the last error is re-raised
+        base_delay: Delay before the first retry, doubled each attempt
+        max_delay: Upper bound on a single delay
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Callers may hold on to a client, so don't swap it underneath them
+            return retry_db(
+                lambda: func(*args, **kwargs),
+                retries=retries,
+                base=base_delay,
+                cap=max_delay,
+                reconnect=False,
+                name=func.__name__
+            )
+        return wrapper
+    return decorator
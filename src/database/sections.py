@@ -1,8 +1,11 @@
 """Project sections database operations for worker."""
 
+import logging
 from .connection import get_db
 from typing import List, Dict, Any
 
+log = logging.getLogger(__name__)
+
 
 def get_project_sections(project_id: str) -> List[Dict[str, Any]]:
     """
@@ -21,5 +24,5 @@ def get_project_sections(project_id: str) -> List[Dict[str, Any]]:
         ).order("sort_order").execute()
         return response.data or []
     except Exception as e:
-        print(f"Error fetching sections: {e}")
+        log.error(f"Error fetching sections: {e}")
         return []
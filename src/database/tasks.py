@@ -1,9 +1,19 @@
 """Task queue database operations."""
 
+import logging
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+from datetime import datetime, timezone
 from .connection import get_db
 
+log = logging.getLogger(__name__)
+
+_UTC = timezone.utc
+
+
+def _now_iso() -> str:
+    """Current time as a timezone-aware UTC ISO 8601 string."""
+    return datetime.now(_UTC).isoformat()
+
 
 def create_task(
     user_id: str,
@@ -33,7 +43,7 @@ def create_task(
         }).execute()
         return result.data[0] if result.data else None
     except Exception as e:
-        print(f"Error creating task: {e}")
+        log.error(f"Error creating task: {e}")
         return None
 
 
@@ -44,7 +54,7 @@ def get_task(task_id: str) -> Optional[Dict[str, Any]]:
         result = db.table("task_queue").select("*").eq("id", task_id).execute()
         return result.data[0] if result.data else None
     except Exception as e:
-        print(f"Error getting task: {e}")
+        log.error(f"Error getting task: {e}")
         return None
 
 
@@ -62,7 +72,7 @@ def get_user_tasks(
         result = query.order("created_at", desc=True).limit(limit).execute()
         return result.data or []
     except Exception as e:
-        print(f"Error getting user tasks: {e}")
+        log.error(f"Error getting user tasks: {e}")
         return []
 
 
@@ -79,7 +89,7 @@ def get_project_tasks(
         result = query.order("created_at", desc=True).execute()
         return result.data or []
     except Exception as e:
-        print(f"Error getting project tasks: {e}")
+        log.error(f"Error getting project tasks: {e}")
         return []
 
 
@@ -90,7 +100,7 @@ def get_active_task(project_id: str, task_type: str) -> Optional[Dict[str, Any]]
         result = db.table("task_queue").select("*").eq("project_id", project_id).eq("task_type", task_type).in_("status", ["pending", "processing"]).order("created_at", desc=True).limit(1).execute()
         return result.data[0] if result.data else None
     except Exception as e:
-        print(f"Error getting active task: {e}")
+        log.error(f"Error getting active task: {e}")
         return None
 
 
@@ -108,7 +118,7 @@ def update_task_progress(
         }).eq("id", task_id).execute()
         return True
     except Exception as e:
-        print(f"Error updating task progress: {e}")
+        log.error(f"Error updating task progress: {e}")
         return False
 
 
@@ -119,15 +129,11 @@ def complete_task(
     """Mark a task as completed."""
     db = get_db()
     try:
-        db.table("task_queue").update({
-            "status": "completed",
-            "progress": 100,
-            "result_data": result_data,
-            "completed_at": datetime.utcnow().isoformat()
-        }).eq("id", task_id).execute()
+        # completed_at is stamped by the DB (see complete_task SQL function)
+        db.rpc("complete_task", {"_id": task_id, "_result": result_data}).execute()
         return True
     except Exception as e:
-        print(f"Error completing task: {e}")
+        log.error(f"Error completing task: {e}")
         return False
 
 
@@ -135,14 +141,11 @@ def fail_task(task_id: str, error_message: str) -> bool:
     """Mark a task as failed."""
     db = get_db()
     try:
-        db.table("task_queue").update({
-            "status": "failed",
-            "error_message": error_message,
-            "completed_at": datetime.utcnow().isoformat()
-        }).eq("id", task_id).execute()
+        # completed_at is stamped by the DB (see fail_task SQL function)
+        db.rpc("fail_task", {"_id": task_id, "_error": error_message}).execute()
         return True
     except Exception as e:
-        print(f"Error failing task: {e}")
+        log.error(f"Error failing task: {e}")
         return False
 
 
@@ -152,11 +155,11 @@ def cancel_task(task_id: str) -> bool:
     try:
         db.table("task_queue").update({
             "status": "cancelled",
-            "completed_at": datetime.utcnow().isoformat()
+            "completed_at": _now_iso()
         }).eq("id", task_id).eq("status", "pending").execute()
         return True
     except Exception as e:
-        print(f"Error cancelling task: {e}")
+        log.error(f"Error cancelling task: {e}")
         return False
 
 
@@ -167,5 +170,5 @@ def claim_next_task(worker_id: str) -> Optional[Dict[str, Any]]:
         result = db.rpc("claim_next_task", {"worker": worker_id}).execute()
         return result.data[0] if result.data else None
     except Exception as e:
-        print(f"Error claiming task: {e}")
+        log.error(f"Error claiming task: {e}")
         return None
@@ -1,8 +1,11 @@
 """User database operations."""
 
+import logging
 from .connection import get_db
 from typing import List, Dict, Any, Optional
 
+log = logging.getLogger(__name__)
+
 
 def get_all_users() -> List[Dict[str, Any]]:
     """
@@ -16,7 +19,7 @@ def get_all_users() -> List[Dict[str, Any]]:
         response = db.table("profiles").select("*").order("created_at", desc=True).execute()
         return response.data or []
     except Exception as e:
-        print(f"Error fetching users: {e}")
+        log.error(f"Error fetching users: {e}")
         return []
 
 
@@ -54,7 +57,7 @@ def update_user_profile(user_id: str, **kwargs) -> Optional[Dict[str, Any]]:
         response = db.table("profiles").update(kwargs).eq("id", user_id).execute()
         return response.data[0] if response.data else None
     except Exception as e:
-        print(f"Error updating user profile: {e}")
+        log.error(f"Error updating user profile: {e}")
         return None
 
 
@@ -70,16 +73,16 @@ def update_user_role(user_id: str, role: str) -> bool:
         True if successful
     """
     if role not in ["pending", "user", "admin"]:
-        print(f"Invalid role: {role}")
+        log.warning(f"Invalid role: {role}")
         return False
 
     try:
         db = get_db()
         response = db.table("profiles").update({"role": role}).eq("id", user_id).execute()
-        print(f"Update role response: {response.data}")
+        log.info(f"Update role response: {response.data}")
         return True
     except Exception as e:
-        print(f"Error updating user role: {e}")
+        log.error(f"Error updating user role: {e}")
         return False
 
 
@@ -98,7 +101,7 @@ def delete_user(user_id: str) -> bool:
         db.table("profiles").delete().eq("id", user_id).execute()
         return True
     except Exception as e:
-        print(f"Error deleting user: {e}")
+        log.error(f"Error deleting user: {e}")
         return False
 
 
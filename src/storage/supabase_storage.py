@@ -1,13 +1,22 @@
 """Supabase storage operations (worker version - no streamlit)."""
 
+import logging
 from supabase import Client
-from typing import Optional
+from typing import Optional, IO, Union
+import io
+import tempfile
+import httpx
 import uuid
 import re
 import unicodedata
 
 from ..database.connection import get_db
 
+log = logging.getLogger(__name__)
+
+# Downloads larger than this spill from memory to a temp file on disk
+DOWNLOAD_SPOOL_MAX_BYTES = 32 << 20
+
 
 def get_storage_client() -> Client:
     """Get Supabase client for storage operations."""
@@ -16,7 +25,7 @@ def get_storage_client() -> Client:
 
 def upload_file(
     bucket_id: str,
-    file_data: bytes,
+    file_data: Union[bytes, IO[bytes]],
     file_path: str,
     content_type: str = "application/octet-stream"
 ) -> Optional[str]:
@@ -25,13 +34,19 @@ def upload_file(
 
     Args:
         bucket_id: Storage bucket name
-        file_data: File content as bytes
+        file_data: File content as bytes or a seekable binary file object
+            (e.g. io.BytesIO), streamed without copying to bytes
         file_path: Destination path in bucket
         content_type: MIME type of the file
 
     Returns:
         File path if successful, None otherwise
     """
+    if not isinstance(file_data, bytes):
+        # storage3 streams BufferedReader uploads; anything else must be bytes or a path
+        file_data.seek(0)
+        file_data = io.BufferedReader(file_data)
+
     client = get_storage_client()
     client.storage.from_(bucket_id).upload(
         path=file_path,
@@ -70,7 +85,7 @@ def sanitize_filename(filename: str) -> str:
 
 def upload_requirement_doc(
     grant_id: str,
-    file_data: bytes,
+    file_data: Union[bytes, IO[bytes]],
     filename: str,
     content_type: str = "application/pdf"
 ) -> Optional[str]:
@@ -79,7 +94,7 @@ def upload_requirement_doc(
 
     Args:
         grant_id: Grant UUID
-        file_data: File content as bytes
+        file_data: File content as bytes or a binary file object
         filename: Original filename
         content_type: MIME type
 
@@ -95,7 +110,7 @@ def upload_requirement_doc(
 def upload_project_doc(
     user_id: str,
     project_id: str,
-    file_data: bytes,
+    file_data: Union[bytes, IO[bytes]],
     filename: str,
     content_type: str = "application/pdf"
 ) -> Optional[str]:
@@ -105,7 +120,7 @@ def upload_project_doc(
     Args:
         user_id: User UUID
         project_id: Project UUID
-        file_data: File content as bytes
+        file_data: File content as bytes or a binary file object
         filename: Original filename
         content_type: MIME type
 
@@ -134,7 +149,40 @@ def download_file(bucket_id: str, file_path: str) -> Optional[bytes]:
         response = client.storage.from_(bucket_id).download(file_path)
         return response
     except Exception as e:
-        print(f"Error downloading file: {e}")
+        log.error(f"Error downloading file: {e}")
+        return None
+
+
+def download_file_stream(bucket_id: str, file_path: str) -> Optional[IO[bytes]]:
+    """
+    Download a file from Supabase storage into a spooled temporary file.
+
+    The response is streamed in chunks, so at most DOWNLOAD_SPOOL_MAX_BYTES
+    stay in memory; larger files spill to disk. The caller owns the
+    returned file and should close it (it works as a context manager).
+
+    Args:
+        bucket_id: Storage bucket name
+        file_path: File path in bucket
+
+    Returns:
+        Seekable binary file positioned at the start, or None
+    """
+    signed_url = get_signed_url(bucket_id, file_path, expires_in=300)
+    if not signed_url:
+        return None
+
+    spool = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_MAX_BYTES)
+    try:
+        with httpx.stream("GET", signed_url, timeout=60.0) as response:
+            response.raise_for_status()
+            for chunk in response.iter_bytes(chunk_size=1 << 20):
+                spool.write(chunk)
+        spool.seek(0)
+        return spool
+    except Exception as e:
+        spool.close()
+        log.error(f"Error downloading file: {e}")
         return None
 
 
@@ -154,7 +202,7 @@ def delete_file(bucket_id: str, file_path: str) -> bool:
         client.storage.from_(bucket_id).remove([file_path])
         return True
     except Exception as e:
-        print(f"Error deleting file: {e}")
+        log.error(f"Error deleting file: {e}")
         return False
 
 
@@ -174,7 +222,7 @@ def get_public_url(bucket_id: str, file_path: str) -> Optional[str]:
         response = client.storage.from_(bucket_id).get_public_url(file_path)
         return response
     except Exception as e:
-        print(f"Error getting public URL: {e}")
+        log.error(f"Error getting public URL: {e}")
         return None
 
 
@@ -197,7 +245,7 @@ def get_signed_url(bucket_id: str, file_path: str, expires_in: int = 3600) -> Op
         )
         return response.get("signedURL")
     except Exception as e:
-        print(f"Error creating signed URL: {e}")
+        log.error(f"Error creating signed URL: {e}")
         return None
 
 
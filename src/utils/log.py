@@ -0,0 +1,62 @@
+"""Queue-backed logging setup for the worker."""
+
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None)).keys()
+) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+
+class ExtraFormatter(logging.Formatter):
+    """Formatter that appends extra= fields as key=value pairs."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extras = " ".join(
+            f"{key}={value}"
+            for key, value in vars(record).items()
+            if key not in _RECORD_ATTRS
+        )
+        return f"{line} {extras}" if extras else line
+
+
+def setup_logging(level: str = LOG_LEVEL) -> None:
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Log calls only enqueue the record; writing to stdout happens on the
+    listener thread, so slow output never blocks task processing.
+    Safe to call more than once.
+
+    Args:
+        level: Root log level name (default from LOG_LEVEL env var)
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(ExtraFormatter(LOG_FORMAT))
+
+    # The queue side only renders the message; layout is the listener's job
+    logging.basicConfig(
+        handlers=[QueueHandler(log_queue)], format="%(message)s", level=level, force=True
+    )
+
+    _listener = QueueListener(log_queue, stream)
+    _listener.start()
+    # Drain whatever is still queued on interpreter exit
+    atexit.register(_listener.stop)
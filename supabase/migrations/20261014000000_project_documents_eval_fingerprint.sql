@@ -0,0 +1,5 @@
+-- Fingerprint of the inputs behind the last AI evaluation of a document.
+-- The worker skips re-evaluating documents whose fingerprint is unchanged.
+ALTER TABLE project_documents
+    ADD COLUMN IF NOT EXISTS last_eval_hash TEXT,
+    ADD COLUMN IF NOT EXISTS last_eval_score REAL;
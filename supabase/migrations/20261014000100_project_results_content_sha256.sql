@@ -0,0 +1,7 @@
+-- SHA-256 of a generated result file, so identical re-generations reuse
+-- the stored file instead of uploading a duplicate.
+ALTER TABLE project_results
+    ADD COLUMN IF NOT EXISTS content_sha256 TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_project_results_project_type_generated
+    ON project_results (project_id, result_type, generated_at DESC);
@@ -0,0 +1,19 @@
+-- Wake idle workers as soon as a task is queued (they LISTEN on 'task_queue').
+-- Workers still poll every few seconds in case a notification is missed.
+CREATE OR REPLACE FUNCTION pg_notify_task()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('task_queue', NEW.id::text);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS task_queue_notify ON task_queue;
+
+CREATE TRIGGER task_queue_notify
+    AFTER INSERT ON task_queue
+    FOR EACH ROW
+    WHEN (NEW.status = 'pending')
+    EXECUTE FUNCTION pg_notify_task();
@@ -0,0 +1,23 @@
+-- Finish a task in one call with a server-side timestamp.
+CREATE OR REPLACE FUNCTION complete_task(_id uuid, _result jsonb)
+RETURNS void
+LANGUAGE sql
+AS $$
+    UPDATE task_queue
+    SET status = 'completed',
+        progress = 100,
+        result_data = _result,
+        completed_at = NOW()
+    WHERE id = _id;
+$$;
+
+CREATE OR REPLACE FUNCTION fail_task(_id uuid, _error text)
+RETURNS void
+LANGUAGE sql
+AS $$
+    UPDATE task_queue
+    SET status = 'failed',
+        error_message = _error,
+        completed_at = NOW()
+    WHERE id = _id;
+$$;
@@ -0,0 +1,14 @@
+-- Requeue tasks left in 'processing' by crashed workers in a single UPDATE.
+CREATE OR REPLACE FUNCTION requeue_stale_tasks(_cutoff_seconds int DEFAULT 120)
+RETURNS TABLE(id uuid, task_type text)
+LANGUAGE sql
+AS $$
+    UPDATE task_queue AS t
+    SET status = 'pending',
+        progress = 0,
+        progress_message = 'Requeued after worker restart',
+        worker_id = NULL
+    WHERE t.status = 'processing'
+      AND t.started_at < NOW() - make_interval(secs => _cutoff_seconds)
+    RETURNING t.id, t.task_type;
+$$;
@@ -0,0 +1,15 @@
+-- Write AI-extracted infobit values in one call. Only value, source,
+-- confidence (kept when the new one is NULL) and updated_at are touched,
+-- so label, category or sort_order edits made meanwhile survive.
+CREATE OR REPLACE FUNCTION bulk_update_infobits(_rows jsonb)
+RETURNS void
+LANGUAGE sql
+AS $$
+    UPDATE project_infobits AS p
+    SET value = r.value,
+        source = r.source,
+        confidence = COALESCE(r.confidence, p.confidence),
+        updated_at = NOW()
+    FROM jsonb_to_recordset(_rows) AS r(id uuid, value text, source text, confidence double precision)
+    WHERE p.id = r.id;
+$$;
@@ -0,0 +1,11 @@
+"""Tests for parsing generated document content."""
+
+from src.ai.document_generator import parse_amount
+
+
+def test_parse_amount_handles_spaces_and_currency():
+    assert parse_amount("1 000 EUR") == 1000
+    assert parse_amount("1 000 €") == 1000
+    assert parse_amount("2,500") == 2500
+    assert parse_amount("12.5") == 12.5
+    assert parse_amount("n/a") == 0
@@ -0,0 +1,37 @@
+"""Tests for document parsing helpers."""
+
+import io
+
+from src.ai import document_parser
+from src.ai.document_parser import SCANNED_PDF_MIN_BYTES, DocumentParser
+
+
+def _pdf(body: bytes, size: int) -> io.BytesIO:
+    return io.BytesIO(b"%PDF-1.7\n" + body + b"\0" * size)
+
+
+def test_large_pdf_without_fonts_looks_scanned():
+    fh = _pdf(b"/XObject /Image", SCANNED_PDF_MIN_BYTES)
+
+    assert DocumentParser()._looks_scanned(fh)
+    assert fh.tell() == 0
+
+
+def test_small_pdf_without_fonts_is_parsed():
+    assert not DocumentParser()._looks_scanned(_pdf(b"/Image", 10))
+
+
+def test_font_or_object_stream_marker_means_text():
+    parser = DocumentParser()
+
+    assert not parser._looks_scanned(_pdf(b"/Font", SCANNED_PDF_MIN_BYTES))
+    assert not parser._looks_scanned(_pdf(b"/ObjStm", SCANNED_PDF_MIN_BYTES))
+
+
+def test_marker_split_across_chunks_is_found(monkeypatch):
+    monkeypatch.setattr(document_parser, "_SCAN_CHUNK", 8)
+    # "/Font" starts at byte 6, so it straddles the first 8-byte chunk
+    fh = io.BytesIO(b"%PDF-1" + b"/Font" + b"\0" * SCANNED_PDF_MIN_BYTES)
+
+    assert not DocumentParser()._looks_scanned(fh)
+
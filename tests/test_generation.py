@@ -0,0 +1,48 @@
+"""Tests for deduplicating generated artifacts."""
+
+import hashlib
+import io
+from datetime import datetime
+
+from openpyxl import Workbook
+
+from handlers.generation import _content_digest
+
+
+def _xlsx(value, created):
+    wb = Workbook()
+    wb.active["A1"] = value
+    wb.properties.created = created
+    wb.properties.modified = created
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def test_digest_ignores_core_properties_timestamps():
+    first = _xlsx("same", datetime(2026, 1, 1, 8, 0, 0))
+    second = _xlsx("same", datetime(2026, 1, 2, 9, 30, 0))
+
+    assert first != second
+    assert _content_digest(first) == _content_digest(second)
+
+
+def test_digest_changes_with_content():
+    created = datetime(2026, 1, 1)
+
+    assert _content_digest(_xlsx("a", created)) != _content_digest(_xlsx("b", created))
+
+
+def test_digest_keeps_buffer_position():
+    buffer = io.BytesIO(_xlsx("a", datetime(2026, 1, 1)))
+    buffer.seek(7)
+
+    _content_digest(buffer)
+
+    assert buffer.tell() == 7
+
+
+def test_non_zip_data_is_hashed_as_is():
+    data = b"not a zip"
+
+    assert _content_digest(data) == hashlib.sha256(data).hexdigest()
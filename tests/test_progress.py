@@ -0,0 +1,49 @@
+"""Tests for coalescing task progress updates."""
+
+from handlers.progress import ProgressThrottler
+
+
+def _throttler(sent):
+    # Long interval so the flush timer never fires during a test
+    return ProgressThrottler(lambda p, m: sent.append((p, m)), min_delta=10, min_interval=60)
+
+
+def test_small_steps_are_held_back_until_close():
+    sent = []
+    throttler = _throttler(sent)
+
+    throttler(0, "start")
+    throttler(3, "a")
+    throttler(5, "b")
+    assert sent == [(0, "start")]
+
+    throttler.close()
+    assert sent == [(0, "start"), (5, "b")]
+
+
+def test_flush_sends_only_the_newest_pending_update():
+    sent = []
+    throttler = _throttler(sent)
+
+    throttler(20, "first")
+    throttler(21, "x")
+    throttler(22, "y")
+    throttler.flush()
+    throttler.flush()
+
+    assert sent == [(20, "first"), (22, "y")]
+    throttler.close()
+
+
+def test_large_steps_and_completion_are_sent_immediately():
+    sent = []
+    throttler = _throttler(sent)
+
+    throttler(10, "a")
+    throttler(25, "b")
+    throttler(26, "c")
+    throttler(100, "done")
+    throttler.close()
+
+    # The held-back 26 is superseded by 100 and never sent afterwards
+    assert sent == [(10, "a"), (25, "b"), (100, "done")]
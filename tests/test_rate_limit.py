@@ -0,0 +1,40 @@
+"""Tests for the Gemini token-bucket limiter."""
+
+import time
+
+from src.ai.rate_limit import TokenBucket
+
+
+def test_acquire_waits_for_a_request_token():
+    bucket = TokenBucket(rpm=1200, tpm=10**6)  # 20 requests/s
+    bucket.request_tokens = 0
+
+    start = time.monotonic()
+    bucket.acquire()
+
+    assert time.monotonic() - start >= 0.04
+
+
+def test_acquire_waits_for_prompt_tokens():
+    bucket = TokenBucket(rpm=10**6, tpm=6000)  # 100 tokens/s
+    bucket.token_tokens = 0
+
+    start = time.monotonic()
+    bucket.acquire(estimated_tokens=10)
+
+    assert time.monotonic() - start >= 0.08
+
+
+def test_acquire_does_not_wait_with_tokens_left():
+    bucket = TokenBucket(rpm=60, tpm=1000)
+
+    start = time.monotonic()
+    bucket.acquire(estimated_tokens=100)
+
+    assert time.monotonic() - start < 0.05
+    assert bucket.request_tokens < 60
+
+
+def test_zero_rpm_disables_limiting():
+    bucket = TokenBucket(rpm=0, tpm=0)
+    bucket.acquire(estimated_tokens=10**9)
@@ -0,0 +1,31 @@
+"""Tests for compiling grant requirements into prompt text."""
+
+from src.ai.requirements_text import compile_requirements_text, get_requirements_text
+
+
+def test_none_fields_compile_as_empty_text():
+    requirements = [{
+        "name": None,
+        "description": None,
+        "extracted_checklist": [{"name": "Budget", "description": None}, None],
+    }]
+
+    text = compile_requirements_text(requirements)
+
+    assert text == "\n## \n\n- Budget: \n- \n"
+
+
+def test_cache_follows_requirement_updates():
+    grant = {
+        "id": "g1",
+        "updated_at": "2026-01-01",
+        "grant_requirements": [
+            {"id": "r1", "updated_at": "1", "name": "A", "description": "old"},
+        ],
+    }
+    assert "old" in get_requirements_text(grant)
+
+    grant["grant_requirements"] = [
+        {"id": "r1", "updated_at": "2", "name": "A", "description": "new"},
+    ]
+    assert "new" in get_requirements_text(grant)